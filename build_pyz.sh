@@ -0,0 +1,23 @@
+#!/bin/bash
+
+# Chrome 捕獲工具打包腳本：預先編譯位元組碼並打包為 zipapp
+# Build the Chrome capture launcher as a precompiled zipapp
+
+set -e
+
+OUTPUT="video2ppt.pyz"
+BUILD_DIR="$(mktemp -d)"
+trap 'rm -rf "$BUILD_DIR"' EXIT
+
+echo "📦 複製啟動器所需模組..."
+cp chrome_quick_start.py chrome_capture.py video_audio_processor.py lazy_import.py "$BUILD_DIR"/
+
+# 以 -b 產生與原始碼並列的 .pyc，zipimport 可直接載入而不必重新編譯
+echo "🔄 預先編譯位元組碼..."
+python3 -m compileall -q -b "$BUILD_DIR"
+
+echo "🔄 建立 $OUTPUT ..."
+python3 -m zipapp "$BUILD_DIR" -p "/usr/bin/env python3" \
+    -m chrome_quick_start:main -o "$OUTPUT"
+
+echo "✅ 完成，執行方式：python3 $OUTPUT"
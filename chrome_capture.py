@@ -13,16 +13,32 @@ import tkinter as tk
 from tkinter import messagebox, Scale, filedialog, ttk
 import numpy as np
 import cv2
-import pyautogui
+import mss
 from datetime import datetime
 from PIL import Image, ImageTk
-from skimage.metrics import structural_similarity as ssim
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 import subprocess
 import sys
+import importlib.util
 import threading
 import traceback
+import queue
+import multiprocessing as mp
+import struct
+from collections import deque, OrderedDict
+from lazy_import import lazy_import
+
+# selenium 與 pyautogui 只在開啟瀏覽器、截取螢幕時才需要，
+# 啟動介面與捕獲子進程不必為它們付出匯入時間
+webdriver = lazy_import("selenium.webdriver")
+pyautogui = lazy_import("pyautogui")
+
+# numba 與 imagehash（連帶載入 scipy）匯入耗時，啟動時只確認是否安裝，
+# 在捕獲子進程第一次使用時才真正載入
+HAS_IMAGEHASH = importlib.util.find_spec("imagehash") is not None
+HAS_NUMBA = importlib.util.find_spec("numba") is not None
+
+if HAS_IMAGEHASH:
+    imagehash = lazy_import("imagehash")
 
 # 導入 PPT 生成函數
 try:
@@ -141,6 +157,486 @@ except ImportError:
             error_msg = str(e)
             return False, f"生成PowerPoint時出錯: {error_msg}"
 
+def _diff_stats_cv(a, b, thr):
+    """以 OpenCV 計算平均絕對差與變化像素數（未安裝 numba 時使用）"""
+    diff = cv2.absdiff(a, b)
+    return cv2.mean(diff)[0], int(np.count_nonzero(diff > thr))
+
+_diff_stats_impl = None
+
+def diff_stats(a, b, thr):
+    """
+    單次掃描兩張灰度圖，同時計算平均絕對差與變化像素數
+    
+    第一次呼叫時才匯入 numba 並編譯平行核心；未安裝 numba 時使用 OpenCV。
+    
+    參數:
+        a, b: 相同尺寸的 uint8 灰度圖
+        thr: 判定像素已變化的差值閾值
+        
+    返回:
+        (平均絕對差, 差值大於 thr 的像素數)
+    """
+    global _diff_stats_impl
+    if _diff_stats_impl is None:
+        if HAS_NUMBA:
+            import numba
+            
+            @numba.njit(parallel=True, fastmath=True, cache=True)
+            def _diff_stats_numba(a, b, thr):
+                total = 0
+                count = 0
+                for i in numba.prange(a.shape[0]):
+                    for j in range(a.shape[1]):
+                        d = abs(np.int32(a[i, j]) - np.int32(b[i, j]))
+                        total += d
+                        if d > thr:
+                            count += 1
+                return total / a.size, count
+            
+            _diff_stats_impl = _diff_stats_numba
+        else:
+            _diff_stats_impl = _diff_stats_cv
+    return _diff_stats_impl(a, b, thr)
+
+def read_image_size(path):
+    """
+    讀取圖片尺寸而不解碼圖像
+    
+    PNG 直接解析 IHDR 標頭 (寬高位於第 16-24 位元組)，
+    其他格式交由 PIL 只讀取檔頭。
+    """
+    with open(path, 'rb') as f:
+        header = f.read(24)
+    if header[:8] == b'\x89PNG\r\n\x1a\n':
+        return struct.unpack('>II', header[16:24])
+    with Image.open(path) as img:
+        return img.size
+
+def fast_ssim(a, b):
+    """
+    以 OpenCV 高斯濾波計算兩張灰度圖的平均結構相似度 (SSIM)
+    
+    參數:
+        a, b: 相同尺寸的 uint8 灰度圖
+        
+    返回:
+        score: 平均 SSIM 值
+    """
+    a = a.astype(np.float32)
+    b = b.astype(np.float32)
+    c1 = (0.01 * 255) ** 2
+    c2 = (0.03 * 255) ** 2
+    ksize = (11, 11)
+    
+    mu1 = cv2.GaussianBlur(a, ksize, 1.5)
+    mu2 = cv2.GaussianBlur(b, ksize, 1.5)
+    mu1_sq = mu1 * mu1
+    mu2_sq = mu2 * mu2
+    mu1_mu2 = mu1 * mu2
+    sigma1_sq = cv2.GaussianBlur(a * a, ksize, 1.5) - mu1_sq
+    sigma2_sq = cv2.GaussianBlur(b * b, ksize, 1.5) - mu2_sq
+    sigma12 = cv2.GaussianBlur(a * b, ksize, 1.5) - mu1_mu2
+    
+    ssim_map = ((2 * mu1_mu2 + c1) * (2 * sigma12 + c2)) / (
+        (mu1_sq + mu2_sq + c1) * (sigma1_sq + sigma2_sq + c2)
+    )
+    return float(ssim_map.mean())
+
+def ssim_uniform(a, b, win=11):
+    """
+    以積分圖 (summed-area table) 計算均勻窗口的平均 SSIM
+    
+    每個窗口的總和只需四次加減，計算量與窗口大小無關；
+    用於投影片變化檢測時可作為高斯窗口 SSIM 的近似。
+    
+    參數:
+        a, b: 相同尺寸的 uint8 灰度圖
+        win: 窗口邊長
+        
+    返回:
+        score: 平均 SSIM 值
+    """
+    # 圖像小於窗口時沒有完整窗口可用，改用高斯濾波版本
+    if min(a.shape) < win:
+        return fast_ssim(a, b)
+    
+    a = a.astype(np.float32)
+    b = b.astype(np.float32)
+    c1 = (0.01 * 255) ** 2
+    c2 = (0.03 * 255) ** 2
+    n = win * win
+    
+    def window_mean(x):
+        s = cv2.integral(x, sdepth=cv2.CV_64F)
+        return (s[win:, win:] - s[:-win, win:]
+                - s[win:, :-win] + s[:-win, :-win]) / n
+    
+    mu1 = window_mean(a)
+    mu2 = window_mean(b)
+    mu1_sq = mu1 * mu1
+    mu2_sq = mu2 * mu2
+    mu1_mu2 = mu1 * mu2
+    sigma1_sq = window_mean(a * a) - mu1_sq
+    sigma2_sq = window_mean(b * b) - mu2_sq
+    sigma12 = window_mean(a * b) - mu1_mu2
+    
+    ssim_map = ((2 * mu1_mu2 + c1) * (2 * sigma12 + c2)) / (
+        (mu1_sq + mu2_sq + c1) * (sigma1_sq + sigma2_sq + c2)
+    )
+    return float(ssim_map.mean())
+
+_ssim_kernel_cache = {}
+
+def make_ssim_kernel(h, w):
+    """
+    產生針對固定尺寸灰度圖的專用 SSIM 函數
+    
+    捕獲期間 ROI 尺寸固定，因此在開始捕獲時以 numba 編譯一個
+    尺寸、11x11 高斯權重與 SSIM 常數都固定的核心，讓編譯器可以
+    展開與向量化迴圈。同一尺寸只編譯一次；未安裝 numba 或圖像
+    小於窗口時回傳 ssim_uniform。
+    
+    參數:
+        h, w: 灰度圖的高與寬
+        
+    返回:
+        ssim(a, b) -> float
+    """
+    key = (h, w)
+    kernel = _ssim_kernel_cache.get(key)
+    if kernel is not None:
+        return kernel
+    
+    if not HAS_NUMBA or min(h, w) < 11:
+        _ssim_kernel_cache[key] = ssim_uniform
+        return ssim_uniform
+    
+    import numba
+    
+    # 以下數值在編譯時被視為常數
+    gk = tuple(float(v) for v in cv2.getGaussianKernel(11, 1.5).ravel())
+    c1 = (0.01 * 255) ** 2
+    c2 = (0.03 * 255) ** 2
+    out_h = h - 10
+    out_w = w - 10
+    
+    @numba.njit(fastmath=True)
+    def kernel(a, b):
+        # 水平方向高斯濾波（只計算有效區域），五個量分別存放
+        ha = np.zeros((h, out_w))
+        hb = np.zeros((h, out_w))
+        haa = np.zeros((h, out_w))
+        hbb = np.zeros((h, out_w))
+        hab = np.zeros((h, out_w))
+        for i in range(h):
+            for k in range(11):
+                g = gk[k]
+                for j in range(out_w):
+                    x = np.float64(a[i, j + k])
+                    y = np.float64(b[i, j + k])
+                    ha[i, j] += g * x
+                    hb[i, j] += g * y
+                    haa[i, j] += g * x * x
+                    hbb[i, j] += g * y * y
+                    hab[i, j] += g * x * y
+        
+        # 垂直方向濾波與 SSIM 累加融合在同一輪中完成
+        mu1 = np.empty(out_w)
+        mu2 = np.empty(out_w)
+        s11 = np.empty(out_w)
+        s22 = np.empty(out_w)
+        s12 = np.empty(out_w)
+        total = 0.0
+        for i in range(out_h):
+            mu1[:] = 0.0
+            mu2[:] = 0.0
+            s11[:] = 0.0
+            s22[:] = 0.0
+            s12[:] = 0.0
+            for k in range(11):
+                g = gk[k]
+                for j in range(out_w):
+                    mu1[j] += g * ha[i + k, j]
+                    mu2[j] += g * hb[i + k, j]
+                    s11[j] += g * haa[i + k, j]
+                    s22[j] += g * hbb[i + k, j]
+                    s12[j] += g * hab[i + k, j]
+            for j in range(out_w):
+                m1 = mu1[j]
+                m2 = mu2[j]
+                m12 = m1 * m2
+                sigma1_sq = s11[j] - m1 * m1
+                sigma2_sq = s22[j] - m2 * m2
+                sigma12 = s12[j] - m12
+                total += ((2 * m12 + c1) * (2 * sigma12 + c2)) / (
+                    (m1 * m1 + m2 * m2 + c1) * (sigma1_sq + sigma2_sq + c2)
+                )
+        return total / (out_h * out_w)
+    
+    # 以假資料觸發編譯，避免第一次比較時的延遲
+    dummy = np.zeros((h, w), dtype=np.uint8)
+    kernel(dummy, dummy)
+    
+    _ssim_kernel_cache[key] = kernel
+    return kernel
+
+def _compute_phash(gray):
+    """計算 ROI 灰度圖的感知哈希"""
+    return imagehash.phash(Image.fromarray(gray))
+
+def _capture_worker(roi, cfg, out_q, cmd_q):
+    """
+    捕獲子進程：擁有 mss、OpenCV 與相似度計算，與介面進程之間只傳遞
+    狀態文字、已保存的檔名與壓縮後的預覽圖，避免與 Tk 主循環爭搶 GIL
+    
+    送出的訊息為 (kind, payload)：
+        status  - 狀態列文字
+        log     - 日誌文字
+        saved   - 已保存投影片的路徑
+        preview - (JPEG 位元組, 原始螢幕尺寸)
+        autostop - 自動停止的說明文字
+        done    - 已保存的投影片數量，子進程即將結束
+    
+    接收的指令為 (cmd, arg)：stop / pause / auto_stop
+    """
+    # 全螢幕預覽最多每 0.25 秒更新一次，UI 無法以捕獲頻率重繪
+    preview_period = 0.25
+    # 預覽縮小到此寬度以內再編碼傳送
+    preview_max_width = 1280
+    
+    # 將迴圈中反覆使用的設定綁定為區域變數
+    threshold = cfg['threshold']
+    interval = cfg['interval']
+    hamming_threshold = cfg['hamming_threshold']
+    use_phash = cfg['similarity_algorithm'] == 'phash'
+    auto_stop_enabled = cfg['auto_stop_enabled']
+    inactivity_timeout = cfg['inactivity_timeout']
+    output_folder = cfg['output_folder']
+    sleep = time.sleep
+    
+    # 預先編譯 numba 差異核心，避免第一次檢測時的編譯延遲
+    if HAS_NUMBA:
+        dummy = np.zeros((2, 2), dtype=np.uint8)
+        diff_stats(dummy, dummy, 25)
+    
+    # 投影片由背景線程寫入磁碟，避免編碼阻塞捕獲循環
+    save_q = queue.Queue(maxsize=16)
+    
+    def writer_loop():
+        while True:
+            filename, frame = save_q.get()
+            try:
+                # JPEG 編碼遠快於 PNG，生成 PPT 時圖片會重新嵌入
+                cv2.imwrite(filename, frame, [cv2.IMWRITE_JPEG_QUALITY, 92])
+            except Exception as e:
+                out_q.put(("log", f"寫入投影片時出錯: {str(e)}"))
+            finally:
+                save_q.task_done()
+    
+    threading.Thread(target=writer_loop, daemon=True).start()
+    
+    slide_count = 0
+    
+    def save_slide(frame_bgra):
+        nonlocal slide_count
+        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        filename = os.path.join(
+            output_folder, f"slide_{timestamp}_{slide_count:03d}.jpg"
+        )
+        # 只在保存時才轉為 BGR，轉換結果是獨立的陣列可直接交給寫入線程；
+        # 佇列已滿時阻塞等待，而不是丟棄投影片
+        save_q.put((filename, cv2.cvtColor(frame_bgra, cv2.COLOR_BGRA2BGR)))
+        out_q.put(("saved", filename))
+        slide_count += 1
+    
+    # ROI 已在 start_capture 中換算為 mss 監視器座標並校正到螢幕範圍內
+    x1, y1, x2, y2 = roi
+    # HiDPI 螢幕上 mss 回傳的像素數可能大於邏輯座標，緩衝區依第一幀配置
+    gray_buf = None
+    previous_gray_small = None
+    prev_hash = None
+    last_change_time = time.time()
+    last_preview_ts = 0.0
+    last_fingerprint = None
+    is_paused = False
+    running = True
+    
+    try:
+        # mss 實例在子進程中建立並重用，避免每幀重新建立
+        with mss.mss() as sct:
+            monitor = sct.monitors[1]
+            roi_bbox = {
+                'left': monitor['left'] + x1, 'top': monitor['top'] + y1,
+                'width': x2 - x1, 'height': y2 - y1
+            }
+            
+            # 以截止時間排程，使實際間隔不受每次計算耗時影響
+            next_tick = time.monotonic()
+            
+            while running:
+                # 處理介面進程送來的指令
+                while True:
+                    try:
+                        cmd, arg = cmd_q.get_nowait()
+                    except queue.Empty:
+                        break
+                    if cmd == 'stop':
+                        running = False
+                    elif cmd == 'pause':
+                        is_paused = arg
+                    elif cmd == 'auto_stop':
+                        auto_stop_enabled = arg
+                if not running:
+                    break
+                
+                if not is_paused:
+                    try:
+                        # 定期截取全螢幕作為預覽
+                        now = time.monotonic()
+                        if now - last_preview_ts > preview_period:
+                            last_preview_ts = now
+                            full = np.asarray(sct.grab(monitor))
+                            
+                            # 以 32x32 縮圖作為指紋，畫面未變化時跳過預覽
+                            fingerprint = hash(cv2.resize(
+                                full, (32, 32), interpolation=cv2.INTER_AREA
+                            ).tobytes())
+                            if fingerprint != last_fingerprint:
+                                last_fingerprint = fingerprint
+                                full_h, full_w = full.shape[:2]
+                                if full_w > preview_max_width:
+                                    scale = preview_max_width / full_w
+                                    full = cv2.resize(
+                                        full, (0, 0), fx=scale, fy=scale,
+                                        interpolation=cv2.INTER_AREA
+                                    )
+                                ok, buf = cv2.imencode(
+                                    '.jpg',
+                                    cv2.cvtColor(full, cv2.COLOR_BGRA2BGR),
+                                    [cv2.IMWRITE_JPEG_QUALITY, 80]
+                                )
+                                if ok:
+                                    out_q.put((
+                                        "preview",
+                                        (buf.tobytes(), (full_w, full_h))
+                                    ))
+                        
+                        # 直接擷取 ROI 區域，mss 回傳 BGRA 像素
+                        raw = sct.grab(roi_bbox)
+                        roi_frame = np.frombuffer(
+                            raw.raw, dtype=np.uint8
+                        ).reshape(raw.height, raw.width, 4)
+                        if gray_buf is None or gray_buf.shape != roi_frame.shape[:2]:
+                            gray_buf = np.empty(roi_frame.shape[:2], dtype=np.uint8)
+                        
+                        # BGRA 一次轉為灰度圖（上一幀的灰度圖已快取）
+                        gray_current = cv2.cvtColor(
+                            roi_frame, cv2.COLOR_BGRA2GRAY, dst=gray_buf
+                        )
+                        
+                        # 縮小為 1/4 再比較，SSIM 計算量約減少 16 倍
+                        # （保存的投影片仍為原解析度的 roi_frame）
+                        if min(gray_current.shape) >= 28:
+                            gray_current = cv2.resize(
+                                gray_current, (0, 0), fx=0.25, fy=0.25,
+                                interpolation=cv2.INTER_AREA
+                            )
+                        else:
+                            # 緩衝區下一幀會被覆寫，需保留獨立副本
+                            gray_current = gray_current.copy()
+                        
+                        # 檢查是否需要保存
+                        if previous_gray_small is None:
+                            # 第一幀直接保存
+                            save_slide(roi_frame)
+                            previous_gray_small = gray_current
+                            if use_phash:
+                                prev_hash = _compute_phash(gray_current)
+                            else:
+                                # ROI 尺寸在本次捕獲中固定，編譯專用 SSIM 核心
+                                ssim_kernel = make_ssim_kernel(*gray_current.shape)
+                            last_change_time = time.time()  # 初始化最後變化時間
+                        else:
+                            # 計算相似度
+                            if use_phash:
+                                # 感知哈希：以漢明距離判斷投影片是否切換
+                                current_hash = _compute_phash(gray_current)
+                                distance = prev_hash - current_hash
+                                changed = distance > hamming_threshold
+                                similarity_text = f"漢明距離: {distance}"
+                            else:
+                                # 將兩幀調整為相同大小
+                                if gray_current.shape != previous_gray_small.shape:
+                                    gray_current = cv2.resize(
+                                        gray_current, 
+                                        (previous_gray_small.shape[1], 
+                                         previous_gray_small.shape[0])
+                                    )
+                                
+                                # 先以平均絕對差快速篩選：低於雜訊水準視為未變化，
+                                # 差異極大視為已切換，只有中間區段才計算 SSIM
+                                mad, _ = diff_stats(
+                                    gray_current, previous_gray_small, 25
+                                )
+                                if mad < 0.5:
+                                    changed = False
+                                    similarity_text = f"平均差異: {mad:.2f}"
+                                elif mad > 30:
+                                    changed = True
+                                    similarity_text = f"平均差異: {mad:.2f}"
+                                else:
+                                    # 計算結構相似度
+                                    score = ssim_kernel(
+                                        previous_gray_small, gray_current
+                                    )
+                                    changed = score < threshold
+                                    similarity_text = f"相似度: {score:.4f}"
+                            
+                            # 檢查無變化時間
+                            current_time = time.time()
+                            time_since_last_change = current_time - last_change_time
+                            minutes = int(time_since_last_change // 60)
+                            seconds = int(time_since_last_change % 60)
+                            
+                            status_text = f"{similarity_text} | 無變化時間: {minutes}分{seconds}秒"
+                            out_q.put(("status", status_text))
+                            
+                            # 檢查是否超過無變化自動停止時間
+                            if (auto_stop_enabled and 
+                                inactivity_timeout > 0 and 
+                                time_since_last_change > inactivity_timeout):
+                                out_q.put((
+                                    "autostop",
+                                    f"已檢測到 {minutes}分{seconds}秒 無變化，自動停止捕獲"
+                                ))
+                                break
+                            
+                            # 如果幀有明顯變化，保存
+                            if changed:
+                                save_slide(roi_frame)
+                                previous_gray_small = gray_current
+                                if use_phash:
+                                    prev_hash = current_hash
+                                last_change_time = current_time  # 更新最後變化時間
+                    
+                    except Exception as e:
+                        out_q.put(("log", f"捕獲過程中出錯: {str(e)}"))
+                
+                # 等待到下一個截止時間；若已落後則從現在重新計時
+                next_tick += interval
+                delay = next_tick - time.monotonic()
+                if delay > 0:
+                    sleep(delay)
+                else:
+                    next_tick = time.monotonic()
+    except Exception as e:
+        out_q.put(("log", f"捕獲子進程出錯: {str(e)}"))
+    finally:
+        # 等待所有投影片寫入完成後再通知介面進程
+        save_q.join()
+        out_q.put(("done", slide_count))
+
 class ChromeCapture:
     def __init__(self, root=None):
         # 創建主窗口
@@ -154,10 +650,17 @@ class ChromeCapture:
         # 加載配置
         self.load_config()
         
-        # 初始化图片缓存
-        self.photo_cache = []
+        # 日誌時間戳快取
+        self._last_ts_second = None
+        self._last_ts_text = ""
+        
+        # 初始化图片缓存（deque 自動淘汰最舊的圖片）
+        self.photo_cache = deque(maxlen=5)
         self.current_photo = None
         
+        # 螢幕截圖的 BGR 緩衝區，首次截圖時按螢幕尺寸配置
+        self._frame_buf = None
+        
         # 設置自動停止相關屬性
         self.inactivity_timeout = 2 * 60  # 預設2分鐘無變化自動停止（秒）
         self.auto_stop_enabled = True  # 是否啟用自動停止功能
@@ -167,6 +670,7 @@ class ChromeCapture:
         self.slide_make_status_var = tk.StringVar()
         self.slide_make_status_var.set("就緒")
         self.preview_images = []  # 保存預覽圖像引用
+        self._preview_cache = OrderedDict()  # 預覽縮圖 LRU 快取
         self.sort_option_var = tk.StringVar(value="name")  # 預設按文件名排序
         self.slide_ratio_var = tk.StringVar(value="16:9")  # 預設寬螢幕比例
         
@@ -183,14 +687,26 @@ class ChromeCapture:
         self.last_mouse_pos = (0, 0)  # 記錄滑鼠最後位置
         self.roi_selecting = False    # 是否正在選擇ROI
         self.capture_running = False
+        self.is_paused = False
         self.status_var = tk.StringVar()
         self.status_var.set("就緒")
         self.canvas_offset = (0, 0)
+        self._c2s_scale = None  # 畫布→螢幕縮放比例，由 display_frame 設定
+        self._c2s_off = np.zeros(2)
+        self._roi_canvas_key = None  # ROI 畫布座標快取
+        self._roi_canvas_rect = None
         
         # 確保輸出目錄存在
         if not os.path.exists(self.output_folder):
             os.makedirs(self.output_folder)
         
+        # 捕獲子進程與通訊佇列，由 start_capture 建立
+        self._capture_proc = None
+        self._capture_out_q = None
+        self._capture_cmd_q = None
+        self._pending_ui_refresh = False  # 是否已排定預覽重繪
+        self._pending_frame = None
+        
         # 事件綁定
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
     
@@ -236,11 +752,14 @@ class ChromeCapture:
                     self.fallback_method = capture_settings.get(
                         'fallbackMethod', 'opencv')
                     self.similarity_algorithm = capture_settings.get(
-                        'similarityAlgorithm', 'ssim')
+                        'similarityAlgorithm', 'phash')
+                    self.hamming_threshold = capture_settings.get(
+                        'hammingThreshold', 8)
                 else:
                     self.screenshot_method = 'pyautogui'
                     self.fallback_method = 'opencv'
-                    self.similarity_algorithm = 'ssim'
+                    self.similarity_algorithm = 'phash'
+                    self.hamming_threshold = 8
             else:
                 # 默認值
                 self.threshold = 0.95
@@ -251,7 +770,8 @@ class ChromeCapture:
                 self.user_data_dir = ''
                 self.screenshot_method = 'pyautogui'
                 self.fallback_method = 'opencv'
-                self.similarity_algorithm = 'ssim'
+                self.similarity_algorithm = 'phash'
+                self.hamming_threshold = 8
         except Exception as e:
             print(f"加載配置時出錯: {str(e)}")
             # 默認值
@@ -263,7 +783,8 @@ class ChromeCapture:
             self.user_data_dir = ''
             self.screenshot_method = 'pyautogui'
             self.fallback_method = 'opencv'
-            self.similarity_algorithm = 'ssim'
+            self.similarity_algorithm = 'phash'
+            self.hamming_threshold = 8
             
         # 其他設置
         self.output_folder = "slides"
@@ -290,6 +811,27 @@ class ChromeCapture:
         # 設置 Slide 製作標籤頁 UI
         self.setup_slide_make_ui()
     
+    def show_hint_banner(self, text):
+        """在預覽區上方顯示可關閉的使用提示（非模態）"""
+        banner = getattr(self, "_hint_banner", None)
+        if banner is not None and banner.winfo_exists():
+            self._hint_label.config(text=text)
+            return
+        
+        banner = tk.Frame(self.main_tab, bg="#fff8dc", bd=1, relief=tk.GROOVE)
+        banner.pack(fill=tk.X, padx=10, pady=(0, 5), before=self.canvas_frame)
+        
+        self._hint_label = tk.Label(
+            banner, text=text, bg="#fff8dc", justify=tk.LEFT, anchor=tk.W
+        )
+        self._hint_label.pack(side=tk.LEFT, padx=5, pady=5, fill=tk.X, expand=True)
+        
+        tk.Button(
+            banner, text="關閉", command=banner.destroy
+        ).pack(side=tk.RIGHT, padx=5, pady=5, anchor=tk.N)
+        
+        self._hint_banner = banner
+    
     def setup_main_capture_ui(self):
         """設置主捕獲標籤頁 UI"""
         # 上方控制區域
@@ -407,6 +949,15 @@ class ChromeCapture:
         self.canvas = tk.Canvas(self.canvas_frame, bg="black")
         self.canvas.pack(fill=tk.BOTH, expand=True)
         
+        # ROI 框與選擇框只建立一次，之後僅更新座標與顯示狀態
+        self._roi_rect_id = self.canvas.create_rectangle(
+            0, 0, 0, 0, outline="red", width=2, state="hidden", tags="roi"
+        )
+        self._selection_rect_id = self.canvas.create_rectangle(
+            0, 0, 0, 0, outline="green", width=2, state="hidden",
+            tags="selection"
+        )
+        
         # 綁定滑鼠事件
         self.canvas.bind("<ButtonPress-1>", self.on_mouse_down)
         self.canvas.bind("<B1-Motion>", self.on_mouse_move)
@@ -429,8 +980,12 @@ class ChromeCapture:
         self.log("請輸入網址並打開瀏覽器，然後框選要監控的投影片區域")
     
     def log(self, message):
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.log_text.insert(tk.END, f"[{timestamp}] {message}\n")
+        # 同一秒內的日誌重用已格式化的時間戳
+        now = int(time.time())
+        if now != self._last_ts_second:
+            self._last_ts_second = now
+            self._last_ts_text = time.strftime("%H:%M:%S", time.localtime(now))
+        self.log_text.insert(tk.END, f"[{self._last_ts_text}] {message}\n")
         self.log_text.see(tk.END)
     
     def launch_browser(self):
@@ -448,7 +1003,7 @@ class ChromeCapture:
         try:
             # 啟動 Chrome
             if not self.browser:
-                chrome_options = Options()
+                chrome_options = webdriver.ChromeOptions()
                 chrome_options.add_argument("--start-maximized")
                 self.browser = webdriver.Chrome(options=chrome_options)
             
@@ -506,26 +1061,21 @@ class ChromeCapture:
             from pynput.mouse import Listener, Button
             
             # 用於儲存選擇的座標
-            selection_coords = {
-                'start_x': 0, 'start_y': 0, 
-                'end_x': 0, 'end_y': 0, 
-                'selecting': False
-            }
+            sx = sy = ex = ey = 0
+            selecting = False
             
             def on_click(x, y, button, pressed):
+                nonlocal sx, sy, ex, ey, selecting
                 if button == Button.left:
                     if pressed:
                         # 開始選擇
-                        selection_coords['start_x'] = x
-                        selection_coords['start_y'] = y
-                        selection_coords['selecting'] = True
-                    else:
+                        sx, sy = x, y
+                        selecting = True
+                    elif selecting:
                         # 結束選擇
-                        if selection_coords['selecting']:
-                            selection_coords['end_x'] = x
-                            selection_coords['end_y'] = y
-                            selection_coords['selecting'] = False
-                            return False  # 停止監聽
+                        ex, ey = x, y
+                        selecting = False
+                        return False  # 停止監聽
                 elif button == Button.right:
                     # 右鍵取消選擇
                     return False
@@ -536,9 +1086,10 @@ class ChromeCapture:
                 listener.join()
             
             # 處理選擇結果
+            coords = (sx, sy, ex, ey)
             self.root.after(
                 500, 
-                lambda: self._process_browser_selection(selection_coords)
+                lambda: self._process_browser_selection(coords)
             )
         except Exception as e:
             self.log(f"選擇過程中發生錯誤: {str(e)}")
@@ -549,17 +1100,18 @@ class ChromeCapture:
         # 恢復應用程式視窗
         self.root.deiconify()
         
+        start_x, start_y, end_x, end_y = coords
+        
         # 確保選擇有效（開始點與結束點不同）
-        if (coords['start_x'] == coords['end_x'] or 
-                coords['start_y'] == coords['end_y']):
+        if start_x == end_x or start_y == end_y:
             self.log("選擇無效，請重新選擇有效的區域")
             return
         
         # 確保座標是遞增的
-        x1 = min(coords['start_x'], coords['end_x'])
-        y1 = min(coords['start_y'], coords['end_y'])
-        x2 = max(coords['start_x'], coords['end_x'])
-        y2 = max(coords['start_y'], coords['end_y'])
+        x1 = min(start_x, end_x)
+        y1 = min(start_y, end_y)
+        x2 = max(start_x, end_x)
+        y2 = max(start_y, end_y)
         
         # 設定 ROI
         self.roi = (x1, y1, x2, y2)
@@ -582,9 +1134,12 @@ class ChromeCapture:
             self.root.lift()
             self.root.focus_force()
             
-            # 等待 UI 更新
-            self.root.update()
-            self.root.after(200, self._take_browser_screenshot)
+            # 等待 UI 更新後立即截圖；視窗尚未顯示時稍候再試
+            self.root.update_idletasks()
+            if self.root.winfo_ismapped():
+                self.root.after_idle(self._take_browser_screenshot)
+            else:
+                self.root.after(50, self._take_browser_screenshot)
             
         except Exception as e:
             error_msg = f"無法獲取瀏覽器預覽: {str(e)}"
@@ -599,9 +1154,7 @@ class ChromeCapture:
         try:
             # 截取全螢幕
             self.log("正在擷取瀏覽器畫面...")
-            screen = pyautogui.screenshot()
-            screen_np = np.array(screen)
-            screen_bgr = cv2.cvtColor(screen_np, cv2.COLOR_RGB2BGR)
+            screen_bgr = self._grab_screen_bgr()
             
             # 設置實際幀大小
             self.frame_size = (screen_bgr.shape[1], screen_bgr.shape[0])
@@ -629,7 +1182,7 @@ class ChromeCapture:
         # 檢查是否處於可選擇狀態，不管是否正在運行都可以重設選擇
         self.roi_selecting = True
         self.roi_start = (event.x, event.y)
-        self.canvas.delete("roi")
+        self.canvas.itemconfigure(self._roi_rect_id, state="hidden")
     
     def on_mouse_move(self, event):
         if self.roi_selecting:
@@ -658,27 +1211,13 @@ class ChromeCapture:
                 self.canvas.delete("roi_temp")
                 return
             
-            # 將畫布上的座標轉換為螢幕實際座標
-            # 首先獲取圖像的實際位置和大小
-            display_width, display_height = self.display_size
-            offset_x, offset_y = self.canvas_offset
-            
-            # 計算比例
-            screen_width, screen_height = self.frame_size
-            scale_x = screen_width / display_width
-            scale_y = screen_height / display_height
-            
-            # 調整座標以考慮偏移和縮放
-            screen_x1 = int((x1 - offset_x) * scale_x)
-            screen_y1 = int((y1 - offset_y) * scale_y)
-            screen_x2 = int((x2 - offset_x) * scale_x)
-            screen_y2 = int((y2 - offset_y) * scale_y)
+            # 將畫布上的座標轉換為螢幕實際座標（考慮偏移和縮放）
+            pts = np.array([[x1, y1], [x2, y2]])
+            pts = ((pts - self._c2s_off) * self._c2s_scale).astype(int)
             
             # 確保座標在範圍內
-            screen_x1 = max(0, min(screen_x1, screen_width))
-            screen_y1 = max(0, min(screen_y1, screen_height))
-            screen_x2 = max(0, min(screen_x2, screen_width))
-            screen_y2 = max(0, min(screen_y2, screen_height))
+            pts = np.clip(pts, 0, self.frame_size)
+            (screen_x1, screen_y1), (screen_x2, screen_y2) = pts.tolist()
             
             # 保存實際像素座標為ROI
             self.roi = (screen_x1, screen_y1, screen_x2, screen_y2)
@@ -699,44 +1238,19 @@ class ChromeCapture:
     
     def draw_actual_roi(self):
         """按照實際比例繪製ROI框"""
-        if not self.roi or not hasattr(self, 'display_size') or not hasattr(self, 'frame_size'):
+        if not self.roi or self._c2s_scale is None:
             return
         
-        # 清除舊的ROI參考
-        self.canvas.delete("roi")
-        
-        # 獲取ROI座標
-        x1, y1, x2, y2 = self.roi
-        
-        # 計算畫布中的位置
-        display_width, display_height = self.display_size
-        screen_width, screen_height = self.frame_size
-        offset_x, offset_y = self.canvas_offset
-        
-        # 計算比例
-        scale_x = display_width / screen_width
-        scale_y = display_height / screen_height
-        
-        # 計算畫布上的位置
-        canvas_x1 = offset_x + int(x1 * scale_x)
-        canvas_y1 = offset_y + int(y1 * scale_y)
-        canvas_x2 = offset_x + int(x2 * scale_x)
-        canvas_y2 = offset_y + int(y2 * scale_y)
-        
-        # 繪製ROI框
-        self.canvas.create_rectangle(
-            canvas_x1, canvas_y1, canvas_x2, canvas_y2,
-            outline="red", width=2, tags="roi"
-        )
-        
-        self.canvas.update()
+        # 更新ROI框
+        self.canvas.coords(self._roi_rect_id, *self._get_roi_canvas_rect())
+        self.canvas.itemconfigure(self._roi_rect_id, state="normal")
     
     def reset_roi(self):
         """重設選擇的區域"""
         self.roi = None
         self.roi_start = None
         self.roi_end = None
-        self.canvas.delete("roi")
+        self.canvas.itemconfigure(self._roi_rect_id, state="hidden")
         self.canvas.delete("roi_canvas")
         self.log("已重設選擇區域")
         
@@ -768,9 +1282,7 @@ class ChromeCapture:
         """截取螢幕畫面並顯示"""
         try:
             # 截取全螢幕
-            screenshot = pyautogui.screenshot()
-            frame = np.array(screenshot)
-            frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+            frame = self._grab_screen_bgr()
             
             # 設置frame_size
             self.frame_size = (frame.shape[1], frame.shape[0])
@@ -788,8 +1300,22 @@ class ChromeCapture:
             import traceback
             traceback.print_exc()
     
-    def display_frame(self, frame):
-        """顯示影像幀"""
+    def _grab_screen_bgr(self):
+        """截取全螢幕並轉換為 BGR，重用預先配置的緩衝區"""
+        screen = np.asarray(pyautogui.screenshot())
+        if self._frame_buf is None or self._frame_buf.shape != screen.shape:
+            self._frame_buf = np.empty_like(screen)
+        cv2.cvtColor(screen, cv2.COLOR_RGB2BGR, dst=self._frame_buf)
+        return self._frame_buf
+    
+    def display_frame(self, frame, frame_size=None):
+        """
+        顯示影像幀
+        
+        參數:
+            frame: BGR 影像
+            frame_size: 原始螢幕尺寸 (寬, 高)；預覽經過縮小時用於座標換算
+        """
         try:
             # 確保canvas已準備好
             self.root.update_idletasks()
@@ -822,6 +1348,8 @@ class ChromeCapture:
             new_height = max(1, new_height)
             
             # 設置frame_size，用於ROI選擇
+            if frame_size is not None:
+                img_width, img_height = frame_size
             self.frame_size = (img_width, img_height)
                 
             # 儲存顯示尺寸，用於ROI選擇
@@ -836,8 +1364,10 @@ class ChromeCapture:
             # 轉換為PIL圖像
             img = Image.fromarray(resized_frame)
             
-            # 清除畫布
-            self.canvas.delete("all")
+            # 清除畫布（保留重用的 ROI 框與選擇框）
+            self.canvas.delete("frame", "roi_temp", "roi_canvas")
+            self.canvas.itemconfigure(self._roi_rect_id, state="hidden")
+            self.canvas.itemconfigure(self._selection_rect_id, state="hidden")
             
             # 計算居中偏移量
             offset_x = (canvas_width - new_width) // 2
@@ -846,16 +1376,18 @@ class ChromeCapture:
             # 保存當前偏移量以供座標轉換使用
             self.canvas_offset = (offset_x, offset_y)
             
+            # 快取畫布→螢幕的座標轉換參數
+            self._c2s_scale = np.array(
+                [img_width / new_width, img_height / new_height]
+            )
+            self._c2s_off = np.array([offset_x, offset_y])
+            
             # 創建新的Photo對象
             photo = ImageTk.PhotoImage(image=img)
             
-            # 保存到緩存中避免被垃圾回收
+            # 保存到緩存中避免被垃圾回收（超過上限時自動淘汰最舊的）
             self.photo_cache.append(photo)
             
-            # 限制緩存大小
-            if len(self.photo_cache) > 10:
-                self.photo_cache = self.photo_cache[-5:]
-            
             # 更新當前顯示的圖片
             self.current_photo = photo
             
@@ -864,6 +1396,7 @@ class ChromeCapture:
                 offset_x, offset_y,
                 image=self.current_photo, anchor=tk.NW, tags="frame"
             )
+            self.canvas.tag_lower("frame")
             
             # 強制更新畫布
             self.canvas.update()
@@ -882,45 +1415,25 @@ class ChromeCapture:
         """顯示當前ROI參考框"""
         if self.roi is None or self.display_size is None:
             return
-            
-        # 獲取原始框架尺寸
-        img_height, img_width = frame.shape[:2]
-        
-        # 顯示的尺寸
-        display_width, display_height = self.display_size
         
-        # 原始ROI座標
-        x, y, w, h = self.roi
-        
-        # 計算顯示畫面上的ROI座標
-        display_x = int(x * display_width / img_width)
-        display_y = int(y * display_height / img_height)
-        display_w = int(w * display_width / img_width)
-        display_h = int(h * display_height / img_height)
-        
-        # 獲取畫布中心坐標以正確放置 ROI 框
-        canvas_width = self.canvas.winfo_width()
-        canvas_height = self.canvas.winfo_height()
-        
-        # 計算圖像開始的位置
-        img_x = canvas_width // 2 - display_width // 2
-        img_y = canvas_height // 2 - display_height // 2
-        
-        # 計算調整後的 ROI 座標
-        adjusted_x = img_x + display_x
-        adjusted_y = img_y + display_y
-        
-        # 在畫布上繪製矩形框
+        # 直接使用快取的畫布座標更新矩形框
         try:
-            self.canvas.create_rectangle(
-                adjusted_x, adjusted_y, 
-                adjusted_x + display_w, adjusted_y + display_h,
-                outline="red", width=2, tags="roi"
-            )
-            self.canvas.update()  # 確保立即顯示
+            self.canvas.coords(self._roi_rect_id, *self._get_roi_canvas_rect())
+            self.canvas.itemconfigure(self._roi_rect_id, state="normal")
         except Exception as e:
             print(f"顯示ROI框時出錯: {str(e)}")
     
+    def _get_roi_canvas_rect(self):
+        """返回ROI在畫布上的座標，僅在ROI或顯示尺寸改變時重新計算"""
+        key = (self.roi, self.display_size, self.canvas_offset)
+        if key != self._roi_canvas_key:
+            # 將螢幕座標轉換為畫布上的位置
+            pts = np.array(self.roi).reshape(2, 2) / self._c2s_scale
+            pts = pts.astype(int) + self._c2s_off
+            self._roi_canvas_rect = tuple(pts.ravel().tolist())
+            self._roi_canvas_key = key
+        return self._roi_canvas_rect
+    
     def display_selection_box(self):
         """顯示當前選擇框"""
         if not self.roi_start or not hasattr(self, 'canvas_offset'):
@@ -937,15 +1450,13 @@ class ChromeCapture:
             
         offset_x, offset_y = self.canvas_offset
         
-        # 移除舊的選擇框
-        self.canvas.delete("selection")
-        
-        # 繪製新的選擇框
-        self.canvas.create_rectangle(
+        # 更新選擇框
+        self.canvas.coords(
+            self._selection_rect_id,
             x1 + offset_x, y1 + offset_y, 
-            x2 + offset_x, y2 + offset_y,
-            outline="green", width=2, tags="selection"
+            x2 + offset_x, y2 + offset_y
         )
+        self.canvas.itemconfigure(self._selection_rect_id, state="normal")
     
     def start_capture(self):
         """開始捕獲投影片"""
@@ -957,6 +1468,10 @@ class ChromeCapture:
             messagebox.showerror("錯誤", "請先選擇要監控的區域")
             return
         
+        if self._capture_proc is not None:
+            messagebox.showinfo("提示", "上一次捕獲仍在結束中，請稍候")
+            return
+        
         # 獲取當前設置
         self.threshold = self.threshold_scale.get()
         self.interval = self.interval_scale.get()
@@ -970,44 +1485,56 @@ class ChromeCapture:
         try:
             # 獲取最新的螢幕截圖
             screenshot = pyautogui.screenshot()
-            frame = np.array(screenshot)
-            frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+            # cvtColor 會輸出新陣列，這裡以 asarray 直接共用 PIL 緩衝區，省去一次複製
+            frame = cv2.cvtColor(np.asarray(screenshot), cv2.COLOR_RGB2BGR)
             
             # 更新螢幕尺寸
             screen_w, screen_h = frame.shape[1], frame.shape[0]
             self.frame_size = (screen_w, screen_h)
             
-            # 確保 ROI 區域在螢幕範圍內
-            x1, y1, x2, y2 = self.roi
+            # ROI 是在 pyautogui 截圖（實體像素）上選取的，而捕獲子進程的
+            # mss 使用監視器邏輯座標；HiDPI/Retina 螢幕上兩者比例不同
+            with mss.mss() as sct:
+                monitor = sct.monitors[1]
+            mon_w, mon_h = monitor['width'], monitor['height']
+            scale_x = mon_w / screen_w
+            scale_y = mon_h / screen_h
+            rx1, ry1, rx2, ry2 = self.roi
+            x1, x2 = int(round(rx1 * scale_x)), int(round(rx2 * scale_x))
+            y1, y2 = int(round(ry1 * scale_y)), int(round(ry2 * scale_y))
             
-            if x1 < 0 or y1 < 0 or x2 > screen_w or y2 > screen_h:
+            # 確保 ROI 區域在監視器範圍內
+            if x1 < 0 or y1 < 0 or x2 > mon_w or y2 > mon_h:
                 self.log("警告：選擇的區域超出螢幕範圍，已自動調整")
-                x1 = max(0, min(x1, screen_w - 1))
-                y1 = max(0, min(y1, screen_h - 1))
-                x2 = max(0, min(x2, screen_w - 1))
-                y2 = max(0, min(y2, screen_h - 1))
+                x1 = max(0, min(x1, mon_w - 1))
+                y1 = max(0, min(y1, mon_h - 1))
+                x2 = max(0, min(x2, mon_w - 1))
+                y2 = max(0, min(y2, mon_h - 1))
                 
                 # 確保區域有足夠大小
                 if x2 - x1 < 5 or y2 - y1 < 5:
                     messagebox.showerror("錯誤", "選擇的區域太小，請重新選擇")
                     return
                 
-                self.roi = (x1, y1, x2, y2)
+                # 顯示用的 ROI 仍以截圖像素為單位
+                self.roi = (
+                    int(x1 / scale_x), int(y1 / scale_y),
+                    int(x2 / scale_x), int(y2 / scale_y)
+                )
                 
                 # 更新顯示的ROI框
                 self.draw_actual_roi()
             
+            # 保存換算並校正後的 ROI（mss 監視器座標），捕獲循環中不再重複校正
+            self._roi_clamped = (x1, y1, x2, y2)
+            
             # 初始化捕獲所需的變數
             self.slides = []
-            self.previous_frame = None
             self.slide_count = 0  # 重設投影片計數
             self.is_paused = False
             
-            # 顯示最新的一幀帶 ROI 的預覽
-            preview_frame = frame.copy()
-            
-            # 在UI中顯示
-            self.display_frame(preview_frame)
+            # 在UI中顯示最新的一幀帶 ROI 的預覽
+            self.display_frame(frame)
             self.draw_actual_roi()  # 再次繪製ROI確保顯示正確
             
             # 記錄實際捕獲區域
@@ -1021,6 +1548,11 @@ class ChromeCapture:
             print(traceback.format_exc())
             return
         
+        # 未安裝 imagehash 時改用 SSIM
+        if self.similarity_algorithm == 'phash' and not HAS_IMAGEHASH:
+            self.log("未安裝 imagehash，改用 SSIM 比較相似度")
+            self.similarity_algorithm = 'ssim'
+        
         self.capture_running = True
         
         # 更新按鈕狀態
@@ -1029,13 +1561,35 @@ class ChromeCapture:
         self.stop_btn.config(state=tk.NORMAL)
         self.go_btn.config(state=tk.DISABLED)
         
-        # 啟動捕獲線程
-        self.capture_thread = threading.Thread(target=self.capture_loop)
-        self.capture_thread.daemon = True
-        self.capture_thread.start()
+        # 啟動捕獲子進程；子進程自行寫入投影片，只回傳路徑與狀態
+        cfg = {
+            'threshold': self.threshold,
+            'interval': self.interval,
+            'hamming_threshold': self.hamming_threshold,
+            'similarity_algorithm': self.similarity_algorithm,
+            'auto_stop_enabled': self.auto_stop_enabled,
+            'inactivity_timeout': self.inactivity_timeout,
+            'output_folder': self.output_folder,
+        }
+        # 使用 spawn 避免在已載入 Tk 的進程上 fork
+        ctx = mp.get_context("spawn")
+        self._capture_out_q = ctx.Queue()
+        self._capture_cmd_q = ctx.Queue()
+        self._capture_proc = ctx.Process(
+            target=_capture_worker,
+            args=(self._roi_clamped, cfg,
+                  self._capture_out_q, self._capture_cmd_q),
+            daemon=True
+        )
+        self._capture_proc.start()
+        self.root.after(50, self._drain_capture_queue)
         
-        msg = (f"開始捕獲投影片 (閾值: {self.threshold}, "
-               f"間隔: {self.interval}秒")
+        if self.similarity_algorithm == 'phash':
+            msg = (f"開始捕獲投影片 (pHash 漢明距離閾值: "
+                   f"{self.hamming_threshold}, 間隔: {self.interval}秒")
+        else:
+            msg = (f"開始捕獲投影片 (SSIM 閾值: {self.threshold}, "
+                   f"間隔: {self.interval}秒")
         if self.auto_stop_enabled and self.inactivity_timeout > 0:
             msg += (f", 無變化自動停止: "
                     f"{self.inactivity_timeout//60}分鐘)")
@@ -1044,122 +1598,81 @@ class ChromeCapture:
         self.log(msg)
         self.status_var.set("正在捕獲")
         
-    def capture_loop(self):
-        """捕獲循環"""
-        while self.capture_running:
-            if not hasattr(self, 'is_paused') or not self.is_paused:
-                try:
-                    # 獲取螢幕截圖
-                    screenshot = pyautogui.screenshot()
-                    
-                    # 轉換為 OpenCV 格式
-                    frame = np.array(screenshot)
-                    frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-                    
-                    # 顯示帶 ROI 的預覽
-                    preview_frame = frame.copy()
-                    
-                    # 在UI中顯示
-                    self.root.after(
-                        10, lambda f=preview_frame: self.display_frame(f)
-                    )
-                    # 使用新方法繪製ROI
-                    self.root.after(20, self.draw_actual_roi)
-                    
-                    # 剪切 ROI 區域
-                    if self.roi:
-                        x1, y1, x2, y2 = self.roi
-                        # 確保座標不超出範圍
-                        h, w = frame.shape[:2]
-                        x1 = max(0, min(x1, w-1))
-                        y1 = max(0, min(y1, h-1))
-                        x2 = max(0, min(x2, w-1))
-                        y2 = max(0, min(y2, h-1))
-                        roi_frame = frame[y1:y2, x1:x2]
-                        
-                        # 檢查是否需要保存
-                        if self.previous_frame is None:
-                            # 第一幀直接保存
-                            self.save_slide(roi_frame)
-                            self.previous_frame = roi_frame
-                            self.last_change_time = time.time()  # 初始化最後變化時間
-                        else:
-                            # 計算相似度
-                            if self.similarity_algorithm == 'ssim':
-                                # 將兩幀調整為相同大小
-                                if roi_frame.shape != self.previous_frame.shape:
-                                    roi_frame = cv2.resize(
-                                        roi_frame, 
-                                        (self.previous_frame.shape[1], 
-                                         self.previous_frame.shape[0])
-                                    )
-                                    
-                                # 轉換為灰度圖
-                                gray_current = cv2.cvtColor(
-                                    roi_frame, cv2.COLOR_BGR2GRAY
-                                )
-                                gray_last = cv2.cvtColor(
-                                    self.previous_frame, cv2.COLOR_BGR2GRAY
-                                )
-                                
-                                # 計算結構相似度
-                                score, _ = ssim(
-                                    gray_last, gray_current, full=True
-                                )
-                                
-                                # 檢查無變化時間
-                                current_time = time.time()
-                                time_since_last_change = current_time - self.last_change_time
-                                minutes = int(time_since_last_change // 60)
-                                seconds = int(time_since_last_change % 60)
-                                
-                                status_text = f"相似度: {score:.4f} | 無變化時間: {minutes}分{seconds}秒"
-                                self.status_var.set(status_text)
-                                
-                                # 檢查是否超過無變化自動停止時間
-                                if (self.auto_stop_enabled and 
-                                    self.inactivity_timeout > 0 and 
-                                    time_since_last_change > self.inactivity_timeout):
-                                    self.log(f"已檢測到 {minutes}分{seconds}秒 無變化，自動停止捕獲")
-                                    self.root.after(0, self.stop_capture)
-                                    break
-                                
-                                # 如果幀有明顯變化，保存
-                                if score < self.threshold:
-                                    self.save_slide(roi_frame)
-                                    self.previous_frame = roi_frame
-                                    self.last_change_time = current_time  # 更新最後變化時間
-                
-                    # 在UI中顯示
-                    self.root.after(
-                        10, lambda: self.display_frame(preview_frame)
-                    )
-                    
-                except Exception as e:
-                    self.log(f"捕獲過程中出錯: {str(e)}")
-                
-                # 等待指定間隔
-                time.sleep(self.interval)
+    def _drain_capture_queue(self):
+        """在主線程中處理捕獲子進程送回的訊息"""
+        proc = self._capture_proc
+        if proc is None:
+            return
+        
+        latest_preview = None
+        finished = False
+        try:
+            while True:
+                kind, payload = self._capture_out_q.get_nowait()
+                if kind == "status":
+                    self.status_var.set(payload)
+                elif kind == "log":
+                    self.log(payload)
+                elif kind == "saved":
+                    self.slide_count += 1
+                    self.log(f"保存投影片 #{self.slide_count}: {payload}")
+                elif kind == "preview":
+                    # 只顯示本輪最新的一張預覽
+                    latest_preview = payload
+                elif kind == "autostop":
+                    self.log(payload)
+                    self.stop_capture()
+                elif kind == "done":
+                    finished = True
+                    break
+        except queue.Empty:
+            pass
+        
+        if latest_preview is not None and not finished:
+            data, frame_size = latest_preview
+            frame = cv2.imdecode(
+                np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR
+            )
+            if frame is not None:
+                self._request_ui_refresh(frame, frame_size)
+        
+        if finished or not proc.is_alive():
+            proc.join(timeout=1)
+            self._capture_proc = None
+            self.status_var.set("已停止")
+            self.log(f"捕獲已停止，共獲取 {self.slide_count} 張投影片")
+        else:
+            self.root.after(50, self._drain_capture_queue)
     
-    def save_slide(self, frame):
-        """保存投影片截圖"""
-        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        filename = os.path.join(
-            self.output_folder, 
-            f"slide_{timestamp}_{self.slide_count:03d}.png"
-        )
-        cv2.imwrite(filename, frame)
-        self.log(f"保存投影片 #{self.slide_count+1}: {filename}")
-        self.slide_count += 1
+    def _request_ui_refresh(self, frame, frame_size=None):
+        """排定預覽重繪；已有待處理的重繪時只替換為最新一幀"""
+        self._pending_frame = (frame, frame_size)
+        if self._pending_ui_refresh:
+            return
+        self._pending_ui_refresh = True
+        # after_idle 只在 Tk 空閒時執行，避免回呼在事件佇列中堆積
+        self.root.after_idle(self._do_ui_refresh)
+    
+    def _do_ui_refresh(self):
+        """執行合併後的預覽重繪"""
+        self._pending_ui_refresh = False
+        frame, frame_size = self._pending_frame
+        self._pending_frame = None
+        self.display_frame(frame, frame_size)
+        self.draw_actual_roi()
     
     def pause_capture(self):
         """暫停捕獲"""
-        if self.capture_running:
-            self.capture_running = False
+        if self._capture_proc is None:
+            return
+        self.is_paused = not self.is_paused
+        self._capture_cmd_q.put(("pause", self.is_paused))
+        if self.is_paused:
+            self.pause_btn.config(text="繼續")
             self.status_var.set("已暫停")
             self.log("捕獲已暫停")
         else:
-            self.capture_running = True
+            self.pause_btn.config(text="暫停")
             self.status_var.set("正在捕獲")
             self.log("捕獲已繼續")
     
@@ -1174,11 +1687,19 @@ class ChromeCapture:
         self.stop_btn.config(state=tk.DISABLED)
         self.go_btn.config(state=tk.NORMAL)
         
-        self.status_var.set("已停止")
-        self.log(f"捕獲已停止，共獲取 {self.slide_count} 張投影片")
+        # 通知子進程停止；子進程寫完剩餘投影片後回報 done，
+        # 由 _drain_capture_queue 完成收尾
+        if self._capture_proc is not None:
+            self._capture_cmd_q.put(("stop", None))
+            self.status_var.set("正在停止...")
     
     def generate_ppt(self):
-        """生成PowerPoint文件"""
+        """生成PowerPoint文件（在背景線程中執行，避免阻塞介面）"""
+        self.generate_btn.config(state=tk.DISABLED)
+        threading.Thread(target=self._generate_ppt_thread, daemon=True).start()
+    
+    def _generate_ppt_thread(self):
+        """在背景線程中生成PowerPoint文件"""
         try:
             from pptx import Presentation
             from pptx.util import Inches
@@ -1190,14 +1711,14 @@ class ChromeCapture:
             prs.slide_width = Inches(10)
             prs.slide_height = Inches(5.625)
             
-            # 檢查投影片目錄中的PNG文件
+            # 檢查投影片目錄中的圖片文件
             slides = sorted([
                 f for f in os.listdir(self.output_folder) 
-                if f.endswith('.png')
+                if f.lower().endswith(('.png', '.jpg', '.jpeg'))
             ])
             
             if not slides:
-                messagebox.showinfo("提示", "沒有可用的投影片圖像")
+                self.root.after(0, self._generate_ppt_completed, None, None)
                 return
             
             # 添加投影片
@@ -1208,9 +1729,8 @@ class ChromeCapture:
                 # 加載投影片圖像
                 img_path = os.path.join(self.output_folder, slide_file)
                 
-                # 獲取圖像尺寸
-                img = Image.open(img_path)
-                width, height = img.size
+                # 獲取圖像尺寸（只讀取檔頭，不解碼圖像）
+                width, height = read_image_size(img_path)
                 
                 # 計算投影片中的位置和大小
                 slide_width = prs.slide_width
@@ -1231,18 +1751,31 @@ class ChromeCapture:
             output_path = self.output_file
             prs.save(output_path)
             
-            self.log(f"已生成16:9格式PowerPoint文件: {output_path}")
-            messagebox.showinfo("成功", f"已生成16:9格式PowerPoint文件: {output_path}")
+            self.root.after(0, self._generate_ppt_completed, True, output_path)
             
         except Exception as e:
-            self.log(f"生成PowerPoint時出錯: {str(e)}")
-            messagebox.showerror("錯誤", f"生成PowerPoint時出錯: {str(e)}")
+            self.root.after(0, self._generate_ppt_completed, False, str(e))
+    
+    def _generate_ppt_completed(self, success, result):
+        """PowerPoint 生成完成後在主線程中更新介面"""
+        self.generate_btn.config(state=tk.NORMAL)
+        
+        if success is None:
+            messagebox.showinfo("提示", "沒有可用的投影片圖像")
+        elif success:
+            self.log(f"已生成16:9格式PowerPoint文件: {result}")
+            messagebox.showinfo("成功", f"已生成16:9格式PowerPoint文件: {result}")
+        else:
+            self.log(f"生成PowerPoint時出錯: {result}")
+            messagebox.showerror("錯誤", f"生成PowerPoint時出錯: {result}")
     
     def toggle_auto_stop(self):
         """啟用或禁用自動停止功能"""
         self.auto_stop_enabled = self.auto_stop_var.get()
         self.timeout_scale.config(state=tk.NORMAL if self.auto_stop_enabled else tk.DISABLED)
         self.log(f"自動停止功能已{'啟用' if self.auto_stop_enabled else '禁用'}")
+        if self._capture_proc is not None:
+            self._capture_cmd_q.put(("auto_stop", self.auto_stop_enabled))
     
     def run(self):
         """運行主循環"""
@@ -1253,6 +1786,11 @@ class ChromeCapture:
         if self.capture_running:
             if messagebox.askokcancel("退出", "捕獲正在進行中，確定要退出嗎？"):
                 self.capture_running = False
+                if self._capture_proc is not None:
+                    self._capture_cmd_q.put(("stop", None))
+                    self._capture_proc.join(timeout=3)
+                    if self._capture_proc.is_alive():
+                        self._capture_proc.terminate()
                 if self.browser:
                     self.browser.quit()
                 self.root.destroy()
@@ -1489,12 +2027,27 @@ class ChromeCapture:
         # 載入並顯示預覽圖
         for i in range(preview_count):
             try:
-                # 打開圖片並調整大小
-                img = Image.open(image_files[i])
-                img.thumbnail((preview_width, preview_height), Image.LANCZOS)
-                
-                # 轉換為 PhotoImage
-                photo = ImageTk.PhotoImage(img)
+                # 以路徑、修改時間和尺寸作為快取鍵，未變動的圖片不必重新縮放
+                key = (
+                    image_files[i], os.path.getmtime(image_files[i]),
+                    preview_width, preview_height
+                )
+                photo = self._preview_cache.get(key)
+                if photo is not None:
+                    self._preview_cache.move_to_end(key)
+                else:
+                    # 打開圖片並調整大小
+                    img = Image.open(image_files[i])
+                    img.thumbnail(
+                        (preview_width, preview_height),
+                        Image.Resampling.BILINEAR
+                    )
+                    
+                    # 轉換為 PhotoImage
+                    photo = ImageTk.PhotoImage(img)
+                    self._preview_cache[key] = photo
+                    if len(self._preview_cache) > 32:
+                        self._preview_cache.popitem(last=False)
                 preview_images.append(photo)  # 保持引用
                 
                 # 計算位置
@@ -1527,23 +2080,22 @@ class ChromeCapture:
         if not folder_path or not os.path.isdir(folder_path):
             return []
             
-        # 獲取所有圖片文件
-        image_files = []
-        for filename in os.listdir(folder_path):
-            if filename.lower().endswith(('.png', '.jpg', '.jpeg')):
-                image_files.append(os.path.join(folder_path, filename))
+        # 獲取所有圖片文件（scandir 的目錄項目會快取 stat 結果）
+        image_exts = ('.png', '.jpg', '.jpeg')
+        with os.scandir(folder_path) as it:
+            entries = [e for e in it if e.name.lower().endswith(image_exts)]
                 
         # 根據選擇的排序方式進行排序
         sort_option = self.sort_option_var.get()
         
         if sort_option == "name":
             # 按文件名排序
-            image_files.sort()
+            entries.sort(key=lambda e: e.name)
         elif sort_option == "time":
             # 按修改時間排序
-            image_files.sort(key=os.path.getmtime)
+            entries.sort(key=lambda e: e.stat().st_mtime)
             
-        return image_files
+        return [e.path for e in entries]
     
     def make_ppt_from_screenshots(self):
         """從截圖生成 PowerPoint"""
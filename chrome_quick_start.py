@@ -5,40 +5,100 @@
 Chrome捕獲工具快速啟動腳本
 """
 
+import os
 import sys
-import tkinter as tk
-from tkinter import messagebox
-import traceback
-import subprocess
-import importlib
+import hashlib
+import importlib.metadata
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+
+# 必要依賴：(PyPI 套件名稱, 匯入名稱)
+_REQUIRED = (
+    ("selenium", "selenium"),
+    ("opencv-python", "cv2"),
+    ("numpy", "numpy"),
+    ("pillow", "PIL"),
+    ("python-pptx", "pptx"),
+    ("pyautogui", "pyautogui"),
+    ("webdriver-manager", "webdriver_manager"),
+    ("mss", "mss"),
+)
+
+# 使用說明
+HINT_TEXT = (
+    "1. 輸入包含視頻的網址並點擊「打開瀏覽器」\n"
+    "2. 在打開的頁面中播放視頻\n"
+    "3. 框選要監控的投影片區域\n"
+    "4. 點擊「開始捕獲」開始監控並截取投影片\n"
+    "5. 完成後點擊「停止」\n"
+    "6. 使用「Slide 製作」功能處理截取的投影片\n\n"
+    "提示：調整相似度閾值可以控制檢測靈敏度，值越低檢測越靈敏"
+)
+
+
+def _depcheck_stamp_path(packages):
+    """依直譯器與套件清單計算依賴檢查標記檔的路徑"""
+    stamp_key = hashlib.blake2b(
+        f"{sys.executable}|{sys.version}|{','.join(packages)}".encode(),
+        digest_size=16
+    ).hexdigest()
+    return os.path.join(
+        os.path.expanduser("~"), ".cache", "video2ppt",
+        f"depcheck_{stamp_key}.ok"
+    )
+
+
+def _depcheck_stamp_valid(stamp_path):
+    """標記檔存在且比直譯器新時，視為環境未變化"""
+    try:
+        return os.stat(stamp_path).st_mtime > os.stat(sys.executable).st_mtime
+    except OSError:
+        return False
+
+
+def _touch_depcheck_stamp(stamp_path):
+    """記錄本次依賴檢查已通過"""
+    try:
+        os.makedirs(os.path.dirname(stamp_path), exist_ok=True)
+        with open(stamp_path, "a"):
+            pass
+        os.utime(stamp_path, None)
+    except OSError:
+        # 無法寫入快取時只是下次重新檢查
+        pass
 
 
 def check_dependencies():
     """檢查必要依賴是否已安裝"""
-    required_packages = [
-        "selenium", "opencv-python", "numpy", "pillow", 
-        "python-pptx", "scikit-image", "pyautogui", "webdriver-manager"
-    ]
+    # 環境未變化時直接跳過檢查
+    stamp_path = _depcheck_stamp_path([pkg for pkg, _ in _REQUIRED])
+    if _depcheck_stamp_valid(stamp_path):
+        return []
     
-    missing_packages = []
-    
-    for package in required_packages:
+    def probe(entry):
+        """回傳缺失的套件名稱，已安裝時回傳 None"""
+        package, import_name = entry
+        # 只查詢套件的安裝資訊，不執行模組本身的初始化程式碼
         try:
-            # 處理特殊套件名稱
-            import_name = package.replace("-", "_")
-            # 處理 opencv-python 特例
-            if package == "opencv-python":
-                import_name = "cv2"
-            # 處理 python-pptx 特例
-            elif package == "python-pptx":
-                import_name = "pptx"
-            # 處理 pillow 特例
-            elif package == "pillow":
-                import_name = "PIL"
-                
-            importlib.import_module(import_name)
-        except ImportError:
-            missing_packages.append(package)
+            importlib.metadata.distribution(package)
+            return None
+        except importlib.metadata.PackageNotFoundError:
+            pass
+        
+        # 沒有安裝資訊時（例如以原始碼方式放在路徑中），改用 find_spec 定位模組
+        if importlib.util.find_spec(import_name) is None:
+            return package
+        return None
+    
+    # 各套件的查詢互不相關，並行執行以重疊檔案系統掃描的等待時間
+    with ThreadPoolExecutor(max_workers=len(_REQUIRED)) as executor:
+        missing_packages = [
+            package for package in executor.map(probe, _REQUIRED)
+            if package
+        ]
+    
+    if not missing_packages:
+        _touch_depcheck_stamp(stamp_path)
     
     return missing_packages
 
@@ -47,13 +107,41 @@ def install_dependencies(packages):
     """安裝缺失的依賴"""
     print(f"正在安裝必要依賴: {', '.join(packages)}")
     
+    # 優先使用預編譯 wheel 並共用快取，避免從原始碼編譯大型套件
+    cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "video2ppt-pip")
+    pip_args = [
+        "install",
+        "--prefer-binary",
+        "--only-binary=opencv-python,numpy",
+        "--disable-pip-version-check",
+        "--no-input",
+        "--cache-dir", cache_dir,
+    ] + list(packages)
+    
+    # 直接在目前進程中呼叫 pip，省去啟動第二個直譯器的時間；
+    # pip 的內部 API 不保證穩定，無法匯入時才改用子進程執行
     try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install"] + packages)
+        from pip._internal.cli.main import main as pip_main
+    except ImportError:
+        pip_main = None
+    
+    if callable(pip_main):
+        # pip 已開始執行，可能已安裝了部分套件，不再以子進程重跑一次
+        try:
+            return pip_main(pip_args) == 0
+        except Exception as e:
+            import traceback
+            print(f"pip 安裝時出錯: {str(e)}")
+            traceback.print_exc()
+            return False
+    
+    import subprocess
+    try:
+        subprocess.check_call([sys.executable, "-m", "pip"] + pip_args)
         return True
     except subprocess.CalledProcessError:
         return False
 
-
 def main():
     # 檢查依賴
     missing_packages = check_dependencies()
@@ -67,11 +155,17 @@ def main():
                 print("依賴安裝失敗，請手動執行：")
                 print(f"pip install {' '.join(missing_packages)}")
                 sys.exit(1)
+            # 重新檢查一次，確認安裝成功並寫入檢查標記
+            check_dependencies()
         else:
             print("請手動安裝以下依賴後再運行:")
             print(f"pip install {' '.join(missing_packages)}")
             sys.exit(1)
     
+    # 依賴齊全後才載入 Tk，安裝或提前退出的流程不需要它
+    import tkinter as tk
+    from tkinter import messagebox
+    
     try:
         from chrome_capture import ChromeCapture
         
@@ -79,21 +173,13 @@ def main():
         root = tk.Tk()
         app = ChromeCapture(root)
         
-        # 顯示使用提示
-        messagebox.showinfo(
-            "使用說明", 
-            "1. 輸入包含視頻的網址並點擊「打開瀏覽器」\n"
-            "2. 在打開的頁面中播放視頻\n"
-            "3. 框選要監控的投影片區域\n"
-            "4. 點擊「開始捕獲」開始監控並截取投影片\n"
-            "5. 完成後點擊「停止」\n"
-            "6. 使用「Slide 製作」功能處理截取的投影片\n\n"
-            "提示：調整相似度閾值可以控制檢測靈敏度，值越低檢測越靈敏"
-        )
+        # 以視窗內的提示列顯示使用說明，不阻塞主循環啟動
+        root.after(100, lambda: app.show_hint_banner(HINT_TEXT))
         
         app.run()
         
     except Exception as e:
+        import traceback
         error_msg = traceback.format_exc()
         print(f"啟動失敗: {str(e)}\n{error_msg}")
         messagebox.showerror("啟動錯誤", f"程序啟動失敗:\n{str(e)}")
@@ -11,60 +11,226 @@ Chrome捕獲工具增強版快速啟動腳本
 
 import sys
 import os
+import argparse
+import functools
+import hashlib
+import json
+import sysconfig
+import shutil
+import importlib.util
+import time
+import types
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import tkinter as tk
 from tkinter import messagebox, filedialog
 import tkinter.ttk as ttk
 import traceback
-from PIL import Image, ImageTk
+from collections import OrderedDict
 
 
-def check_dependencies():
-    """檢查必要依賴是否已安裝"""
-    required_packages = [
-        "selenium", "opencv-python", "numpy", "pillow", 
-        "python-pptx", "scikit-image", "pyautogui", "webdriver-manager",
-        "openai"
-    ]
+from lazy_import import lazy_import
+
+# PIL 只在預覽圖片時才需要，不讓它拖慢主視窗出現的時間
+Image = lazy_import("PIL.Image")
+ImageTk = lazy_import("PIL.ImageTk")
+
+# 遇到 API 速率限制時的最大重試次數
+_RATE_LIMIT_RETRIES = 3
+
+# 每秒最多送出的 API 請求數，預先節流以免並行請求一起觸發 429
+_MAX_REQUESTS_PER_SECOND = 10
+
+# 投影片圖片副檔名
+_EXT_SET = frozenset({'.png', '.jpg', '.jpeg'})
+_splitext = os.path.splitext
+
+# 預覽圖片改用 LANCZOS 縮放（較清晰但較慢），由 --hq-preview 開啟
+_HIGH_QUALITY_PREVIEW = False
+
+# 依賴檢查結果，每個進程只檢查一次
+_DEPS_CHECKED = None
+
+# 跨次啟動保存的依賴檢查結果
+_DEPS_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "video2ppt", "deps.json"
+)
+
+
+# 資料夾圖片清單快取：資料夾 -> (資料夾修改時間, 圖片清單)
+_IMAGE_LIST_CACHE = {}
+
+
+def _list_images(folder, mtime=None):
+    """
+    以 os.scandir 列出資料夾中的圖片檔案，依檔名排序
     
-    # 分開檢查 markitdown，因為它可能需要特殊處理
-    optional_packages = ["markitdown", "google-genai"]
+    資料夾的修改時間未變（沒有新增、刪除或改名的檔案）時直接
+    返回上次的結果；呼叫端已取得資料夾的 st_mtime_ns 時可由 mtime 傳入
+    """
+    if mtime is None:
+        mtime = os.stat(folder).st_mtime_ns
+    cached = _IMAGE_LIST_CACHE.get(folder)
+    if cached is not None and cached[0] == mtime:
+        return list(cached[1])
     
-    missing_packages = []
-    missing_optional = []
+    with os.scandir(folder) as entries:
+        image_files = sorted(
+            e.path for e in entries
+            if _splitext(e.name)[1].lower() in _EXT_SET and e.is_file()
+        )
+    _IMAGE_LIST_CACHE[folder] = (mtime, image_files)
+    return list(image_files)
+
+
+def _deps_env_key():
+    """
+    計算目前 Python 環境的鍵值
     
-    for package in required_packages:
-        try:
-            # 處理特殊套件名稱
-            import_name = package.replace("-", "_")
-            # 處理 opencv-python 特例
-            if package == "opencv-python":
-                import_name = "cv2"
-            # 處理 python-pptx 特例
-            elif package == "python-pptx":
-                import_name = "pptx"
-            # 處理 pillow 特例
-            elif package == "pillow":
-                import_name = "PIL"
-            # 處理 scikit-image 特例
-            elif package == "scikit-image":
-                import_name = "skimage"
-                
-            __import__(import_name)
-        except ImportError:
-            missing_packages.append(package)
+    由直譯器路徑、版本與 site-packages 內容組成，安裝或移除套件後
+    site-packages 的項目改變，鍵值隨之不同
+    """
+    site_packages = sysconfig.get_paths()["purelib"]
+    try:
+        entries = sorted(os.listdir(site_packages))
+    except OSError:
+        entries = []
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{sys.executable}|{sys.version}|{sys.prefix}".encode())
+    for name in entries:
+        h.update(b"|")
+        h.update(name.encode("utf-8", "surrogateescape"))
+    return h.hexdigest()
+
+
+def _load_deps_cache(env_key):
+    """讀取與目前環境相符的依賴檢查結果，不相符或不存在時返回 None"""
+    try:
+        with open(_DEPS_CACHE_PATH, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("key") != env_key:
+        return None
+    return data.get("missing", []), data.get("missing_optional", [])
+
+
+def _save_deps_cache(env_key, missing_packages, missing_optional):
+    """保存依賴檢查結果；先寫入暫存檔再替換，避免留下不完整的檔案"""
+    try:
+        os.makedirs(os.path.dirname(_DEPS_CACHE_PATH), exist_ok=True)
+        tmp_path = f"{_DEPS_CACHE_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "key": env_key,
+                "missing": missing_packages,
+                "missing_optional": missing_optional
+            }, f)
+        os.replace(tmp_path, _DEPS_CACHE_PATH)
+    except OSError:
+        # 無法寫入快取時只是下次重新檢查
+        pass
+
+
+def _deps_ok_path(env_key):
+    """目前環境的「依賴已確認」標記檔路徑"""
+    return os.path.join(
+        os.path.dirname(_DEPS_CACHE_PATH), f"deps-ok-{env_key}"
+    )
+
+
+def _mark_deps_ok(env_key):
+    """記錄目前環境（env_key 由 _deps_env_key 計算）的依賴已確認齊全"""
+    try:
+        path = _deps_ok_path(env_key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'a'):
+            pass
+    except OSError:
+        pass
+
+
+def _clear_deps_cache():
+    """清除依賴檢查快取與所有標記檔，下次啟動重新檢查"""
+    cache_dir = os.path.dirname(_DEPS_CACHE_PATH)
+    try:
+        with os.scandir(cache_dir) as entries:
+            for entry in entries:
+                if (entry.name.startswith("deps-ok-") or
+                        entry.path == _DEPS_CACHE_PATH):
+                    os.remove(entry.path)
+    except OSError:
+        pass
+
+
+# 圖片內容指紋：路徑 -> (修改時間, 檔案大小, 指紋)
+_FINGERPRINTS = {}
+
+
+def _quick_fingerprint(path):
+    """
+    以 64KB 區塊串流計算檔案的 blake2b 指紋，不解碼圖片
+    
+    修改時間與大小都未變時沿用上次的指紋，不重新讀檔
+    """
+    st = os.stat(path)
+    cached = _FINGERPRINTS.get(path)
+    if (cached is not None and cached[0] == st.st_mtime_ns and
+            cached[1] == st.st_size):
+        return cached[2]
+    
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb', buffering=1 << 16) as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            h.update(block)
+    digest = h.digest()
+    _FINGERPRINTS[path] = (st.st_mtime_ns, st.st_size, digest)
+    return digest
+
+
+def _dedupe_images(image_files):
+    """
+    去除內容完全相同的圖片，保留每組中第一張
     
-    for package in optional_packages:
+    連續捕獲時可能存下重複的畫面，重複圖片不必再呼叫一次 API
+    """
+    seen = set()
+    unique = []
+    for img_path in image_files:
         try:
-            if package == "google-genai":
-                import_name = "google.generativeai"
-            else:
-                import_name = package
-            __import__(import_name)
-        except ImportError:
-            missing_optional.append(package)
+            digest = _quick_fingerprint(img_path)
+        except OSError:
+            # 讀取失敗的圖片交給後續流程回報錯誤
+            unique.append(img_path)
+            continue
+        if digest not in seen:
+            seen.add(digest)
+            unique.append(img_path)
+    return unique
+
+
+def check_dependencies(env_key=None):
+    """
+    檢查必要依賴是否已安裝
+    
+    env_key 為呼叫端已計算的 _deps_env_key()，未提供時自行計算
+    """
+    global _DEPS_CHECKED
+    if _DEPS_CHECKED is not None:
+        return _DEPS_CHECKED
+    
+    # 環境未變化時沿用上次的檢查結果
+    if env_key is None:
+        env_key = _deps_env_key()
+    cached = _load_deps_cache(env_key)
+    if cached is not None:
+        missing_packages, missing_optional = cached
+    else:
+        missing_packages, missing_optional = _probe_dependencies()
+        _save_deps_cache(env_key, missing_packages, missing_optional)
     
     # 檢查 Pandoc 是否已安裝（用於 Markdown 轉 Word）
-    import shutil
     pandoc_path = shutil.which("pandoc")
     if not pandoc_path:
         print("警告: 未安裝 Pandoc，無法將 Markdown 轉換為 Word 格式。")
@@ -77,21 +243,233 @@ def check_dependencies():
         print("如果您想使用 Google Gemini API，請安裝:")
         print("pip install google-genai")
     
+    _DEPS_CHECKED = missing_packages
     return missing_packages
 
 
+# 套件名稱與匯入名稱不同的特例
+_IMPORT_NAMES = {
+    "opencv-python": "cv2",
+    "python-pptx": "pptx",
+    "pillow": "PIL",
+    "google-genai": "google.generativeai",
+}
+
+
+def _is_missing(package):
+    """以 find_spec 只確認模組可被找到，不執行套件本身的初始化程式碼"""
+    import_name = _IMPORT_NAMES.get(package, package.replace("-", "_"))
+    try:
+        return importlib.util.find_spec(import_name) is None
+    except (ImportError, ValueError):
+        return True
+
+
+def _probe_dependencies():
+    """確認必要與可選套件，返回 (缺少的必要套件, 缺少的可選套件)"""
+    required_packages = [
+        "selenium", "opencv-python", "numpy", "pillow", 
+        "python-pptx", "pyautogui", "webdriver-manager",
+        "mss", "openai"
+    ]
+    
+    # 分開檢查 markitdown，因為它可能需要特殊處理
+    optional_packages = ["markitdown", "google-genai"]
+    
+    # 各套件的查詢互不相關，並行執行以重疊檔案系統掃描的等待時間
+    packages = required_packages + optional_packages
+    with ThreadPoolExecutor(max_workers=len(packages)) as executor:
+        missing = dict(zip(packages, executor.map(_is_missing, packages)))
+    
+    missing_packages = [p for p in required_packages if missing[p]]
+    missing_optional = [p for p in optional_packages if missing[p]]
+    return missing_packages, missing_optional
+
+
 def install_dependencies(packages):
-    """安裝缺失的依賴"""
+    """
+    安裝缺失的依賴
+    
+    pip 的輸出即時顯示在進度視窗中（無法開啟視窗時輸出到終端機）；
+    優先使用預編譯 wheel，並略過安裝後的 .pyc 預先編譯與版本檢查
+    """
     import subprocess
     print(f"正在安裝必要依賴: {', '.join(packages)}")
     
     try:
-        subprocess.check_call(
-            [sys.executable, "-m", "pip", "install"] + packages
+        proc = subprocess.Popen(
+            [
+                sys.executable, "-m", "pip", "install",
+                "--prefer-binary", "--no-compile",
+                "--no-input", "--disable-pip-version-check", *packages
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=1,
+            text=True
         )
-        return True
-    except subprocess.CalledProcessError:
+    except OSError as e:
+        print(f"無法執行 pip: {str(e)}")
         return False
+    
+    try:
+        win = tk.Tk()
+    except tk.TclError:
+        # 沒有可用的顯示環境，直接轉印到終端機
+        for line in proc.stdout:
+            print(line, end="")
+        return proc.wait() == 0
+    
+    win.title("正在安裝依賴")
+    win.geometry("640x360")
+    text = tk.Text(win, wrap=tk.WORD)
+    text.pack(fill=tk.BOTH, expand=True)
+    
+    # 讀取 pip 輸出會阻塞，交給背景線程；視窗以 after 定期取出顯示
+    lines = queue.Queue()
+    
+    def read_output():
+        for line in proc.stdout:
+            lines.put(line)
+        proc.wait()
+        lines.put(None)
+    
+    threading.Thread(target=read_output, daemon=True).start()
+    
+    def drain():
+        while True:
+            try:
+                line = lines.get_nowait()
+            except queue.Empty:
+                break
+            if line is None:
+                win.destroy()
+                return
+            print(line, end="")
+            text.insert(tk.END, line)
+            text.see(tk.END)
+        win.after(50, drain)
+    
+    # 安裝進行中不允許關閉視窗
+    win.protocol("WM_DELETE_WINDOW", lambda: None)
+    win.after(50, drain)
+    win.mainloop()
+    return proc.wait() == 0
+
+
+def _copy_file(src, dst):
+    """
+    複製檔案內容（不複製屬性）
+    
+    Linux 上優先使用 os.copy_file_range，在支援的檔案系統（btrfs、XFS 等）
+    可直接共用資料區塊而不搬動資料；不支援時改用 shutil.copyfile
+    """
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(
+                        fsrc.fileno(), fdst.fileno(), remaining
+                    )
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                return
+        except OSError:
+            pass
+    shutil.copyfile(src, dst)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_markitdown_ppt():
+    """延遲載入 markitdown_ppt（只在處理投影片時才需要）"""
+    import markitdown_ppt
+    return markitdown_ppt
+
+
+@functools.lru_cache(maxsize=1)
+def _load_image_analyzer():
+    """延遲載入 image_analyzer（只在使用視覺模型分析時才需要）"""
+    import image_analyzer
+    return image_analyzer
+
+
+def _decode_preview(img_path, window_width, window_height):
+    """解碼圖片並縮放到預覽區大小（可在背景線程執行）"""
+    # 讀取圖片
+    img = Image.open(img_path)
+    
+    img_width, img_height = img.size
+    scale = min(window_width/img_width, window_height/img_height)
+    
+    new_width = int(img_width * scale)
+    new_height = int(img_height * scale)
+    
+    # 確保至少有一個像素
+    new_width = max(1, new_width)
+    new_height = max(1, new_height)
+    
+    # JPEG 可在解碼時直接縮小到不小於目標的尺寸（對 PNG 無作用）
+    img.draft('RGB', (new_width, new_height))
+    
+    if _HIGH_QUALITY_PREVIEW:
+        return img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+    
+    # 調整圖片大小；預覽用 BILINEAR 已足夠，遠快於 LANCZOS
+    # （安裝 Pillow-SIMD 時 BILINEAR 會再以 SIMD 指令加速）。
+    # PNG 無法在解碼時縮小，以 reducing_gap 先做整數倍的區塊平均縮小，
+    # 再以 BILINEAR 處理剩餘的比例
+    return img.resize(
+        (new_width, new_height), Image.Resampling.BILINEAR, reducing_gap=2.0
+    )
+
+
+class _RequestThrottle:
+    """簡單的節流器：讓各線程送出請求的時間至少間隔 1/rate 秒"""
+    
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_time = 0.0
+        self._lock = threading.Lock()
+    
+    def wait(self):
+        """等待到可以送出下一個請求"""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_time)
+            self._next_time = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def _append_markdown_section(path, section):
+    """將一段內容追加到 Markdown 檔案並立即寫出"""
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(section)
+        f.flush()
+
+
+def _is_rate_limited(message):
+    """判斷分析失敗是否由 API 速率限制造成"""
+    text = str(message).lower()
+    return (
+        "429" in text or "rate limit" in text or
+        "resource has been exhausted" in text
+    )
+
+
+def _notify_messagebox(title, message, type="info"):
+    """以 messagebox 顯示訊息（只能在 Tk 主線程呼叫）"""
+    if type == "error":
+        messagebox.showerror(title, message)
+    elif type == "warning":
+        messagebox.showwarning(title, message)
+    else:
+        messagebox.showinfo(title, message)
 
 
 def process_captured_slides(
@@ -100,36 +478,38 @@ def process_captured_slides(
     api_key=None, 
     model="gpt-4o-mini",
     provider="openai",
-    is_academic_mode=False
+    is_academic_mode=False,
+    image_files=None
 ):
-    """處理已捕獲的投影片，生成 Markdown 或增強的文字分析"""
+    """
+    處理已捕獲的投影片，生成 Markdown 或增強的文字分析
+    
+    image_files 為已列出的圖片路徑時不再重新掃描資料夾
+    """
     try:
-        from markitdown_ppt import (
-            process_images_to_ppt, 
-            convert_images_to_markdown
-        )
+        markitdown_ppt = _load_markitdown_ppt()
+        process_images_to_ppt = markitdown_ppt.process_images_to_ppt
+        convert_images_to_markdown = markitdown_ppt.convert_images_to_markdown
         
-        if not os.path.exists(slides_folder) or not os.listdir(slides_folder):
+        if not os.path.isdir(slides_folder):
             messagebox.showinfo("提示", "找不到投影片或資料夾為空")
             return False
             
         # 獲取所有圖片檔案路徑
-        image_files = []
-        for filename in sorted(os.listdir(slides_folder)):
-            if filename.lower().endswith(('.png', '.jpg', '.jpeg')):
-                image_files.append(os.path.join(slides_folder, filename))
+        if image_files is None:
+            image_files = _list_images(slides_folder)
                 
         if not image_files:
             messagebox.showinfo("提示", "未找到圖片檔案")
             return False
         
+        # 輸出檔案直接放在投影片資料夾內
+        output_md = os.path.join(slides_folder, "slides_analysis.md")
+        output_ppt = os.path.join(slides_folder, "slides.pptx")
+        
         if output_format == "markdown" or output_format == "both":
             # 轉換為 Markdown
-            output_md = os.path.join(
-                slides_folder,  # 改為直接在投影片資料夾內
-                "slides_analysis.md"
-            )
-            
+
             # 對於純圖片檔案，MarkItDown 無法處理，但我們仍然可以使用 LLM 分析
             # 這裡的 convert_images_to_markdown 會創建基本的 Markdown 結構，
             # 然後使用 image_analyzer 來增強內容
@@ -169,10 +549,6 @@ def process_captured_slides(
         
         if output_format == "pptx" or output_format == "both":
             # 生成 PPT
-            output_ppt = os.path.join(
-                slides_folder,  # 改為直接在投影片資料夾內
-                "slides.pptx"
-            )
             if process_images_to_ppt(
                 image_dir=slides_folder,
                 output_ppt=output_ppt,
@@ -202,24 +578,42 @@ def process_with_image_analyzer(
     api_key=None, 
     model="o4-mini",
     provider="openai",
-    is_academic_mode=False
+    is_academic_mode=False,
+    use_cache=True,
+    max_workers=4,
+    image_files=None,
+    progress_callback=None,
+    notify=_notify_messagebox,
+    batch_size=1
 ):
-    """使用 OpenAI、Gemini 或 DeepSeek 模型分析圖片內容"""
+    """
+    使用 OpenAI、Gemini 或 DeepSeek 模型分析圖片內容
+    
+    use_cache 為 True 時，相同圖片、模型與提供者的分析結果會從
+    本機快取讀取，不再重複呼叫 API；max_workers 為同時進行的
+    API 請求數；image_files 為已列出的圖片路徑時不再重新掃描資料夾。
+    每完成一張圖片會呼叫 progress_callback(已完成數, 總數)；
+    單張失敗不會中斷其餘圖片，失敗的圖片記錄在結果的 failed 清單中。
+    訊息透過 notify(標題, 內容, 類型) 顯示，在工作線程執行時應傳入
+    轉交主線程顯示的函數。batch_size 大於 1 且提供者支援時，每次請求
+    同時分析多張圖片；批次結果無法使用時自動改為逐張分析
+    """
     try:
-        from image_analyzer import analyze_image
+        image_analyzer = _load_image_analyzer()
+        analyze_image = image_analyzer.analyze_image
+        analyze_images_batch = image_analyzer.analyze_images_batch
+        import llm_cache
         
-        if not os.path.exists(slides_folder) or not os.listdir(slides_folder):
-            messagebox.showinfo("提示", "找不到投影片或資料夾為空")
+        if not os.path.isdir(slides_folder):
+            notify("提示", "找不到投影片或資料夾為空", "info")
             return {"success": False, "error": "找不到投影片或資料夾為空"}
             
         # 獲取所有圖片檔案路徑
-        image_files = []
-        for filename in sorted(os.listdir(slides_folder)):
-            if filename.lower().endswith(('.png', '.jpg', '.jpeg')):
-                image_files.append(os.path.join(slides_folder, filename))
+        if image_files is None:
+            image_files = _list_images(slides_folder)
                 
         if not image_files:
-            messagebox.showinfo("提示", "未找到圖片檔案")
+            notify("提示", "未找到圖片檔案", "info")
             return {"success": False, "error": "未找到圖片檔案"}
         
         # 如果沒有指定輸出檔案，創建預設檔案名稱
@@ -239,84 +633,251 @@ def process_with_image_analyzer(
         current_api_key = api_key or os.environ.get(env_var)
             
         if not current_api_key:
-            messagebox.showwarning(
+            notify(
                 "警告", 
-                f"未提供 {provider.upper()} API Key，無法進行圖片分析"
+                f"未提供 {provider.upper()} API Key，無法進行圖片分析",
+                "warning"
             )
             return {
                 "success": False, 
                 "error": f"未提供 {provider.upper()} API Key"
             }
             
-        # 創建 Markdown 檔案
-        with open(output_file, 'w', encoding='utf-8') as f:
-            provider_display = {
-                "openai": "OpenAI",
-                "gemini": "Google Gemini"
-            }.get(provider.lower(), provider.upper())
+        # 所有工作線程共用同一個節流器
+        throttle = _RequestThrottle(_MAX_REQUESTS_PER_SECOND)
+        
+        # 快取命中與未命中次數
+        cache_stats = {"hits": 0, "misses": 0}
+        stats_lock = threading.Lock()
+        
+        def load_one(img_path):
+            """
+            讀取圖片並查詢快取，返回 (圖片內容, 單張鍵值, 批次鍵值, 快取結果)
             
-            f.write(f"# 投影片內容 {provider_display} 視覺分析\\n\\n")
+            批次請求的提示詞與單張不同，結果存放在獨立的鍵值下；
+            批次模式可沿用單張的結果，單張分析則不會讀到批次的結果
+            """
+            # 圖片只讀取一次，同時用於快取鍵值與 API 請求
+            with open(img_path, 'rb') as img_file:
+                image_bytes = img_file.read()
             
-            # 處理每張圖片
-            success_count = 0
-            for img_path in image_files:
-                img_name = os.path.basename(img_path)
-                f.write(f"## 投影片：{img_name}\\n\\n")
-                f.write(f"![{img_name}]({img_path})\\n\\n")
-                
-                # 分析圖片
+            cache_key = None
+            batch_key = None
+            cached = None
+            if use_cache:
+                cache_key = llm_cache.make_key(
+                    image_bytes, model, provider, is_academic_mode
+                )
+                cached = llm_cache.get(cache_key)
+                if batch_size > 1:
+                    batch_key = llm_cache.make_key(
+                        image_bytes, model, provider, is_academic_mode,
+                        prompt_version=f"{llm_cache.PROMPT_VERSION}-batch"
+                    )
+                    if cached is None:
+                        cached = llm_cache.get(batch_key)
+                with stats_lock:
+                    cache_stats["hits" if cached is not None else "misses"] += 1
+            return image_bytes, cache_key, batch_key, cached
+        
+        def analyze_one(img_path, image_bytes, cache_key):
+            """分析單張圖片（在工作線程中執行）"""
+            # 分析圖片；遇到速率限制時以指數退避重試
+            for attempt in range(_RATE_LIMIT_RETRIES + 1):
+                throttle.wait()
                 success, analysis = analyze_image(
                     image_path=img_path,
                     api_key=current_api_key,
                     model=model,
                     provider=provider,
+                    is_academic_mode=is_academic_mode,
+                    image_bytes=image_bytes,
+                    use_cache=False  # 快取已在 load_one 查詢過
+                )
+                if success or not _is_rate_limited(analysis):
+                    break
+                if attempt < _RATE_LIMIT_RETRIES:
+                    time.sleep(2 ** (attempt + 1))
+            
+            # 只快取成功的結果
+            if success and cache_key is not None:
+                llm_cache.set(cache_key, analysis)
+            return success, analysis
+        
+        def analyze_chunk(paths):
+            """分析一組圖片，快取未命中的圖片盡量合併為一次請求"""
+            loaded = [load_one(img_path) for img_path in paths]
+            # 快取命中的圖片不呼叫 API
+            chunk_results = [
+                (True, cached) if cached is not None else None
+                for _, _, _, cached in loaded
+            ]
+            pending = [i for i, r in enumerate(chunk_results) if r is None]
+            
+            if len(pending) > 1:
+                throttle.wait()
+                success, analyses = analyze_images_batch(
+                    image_paths=[paths[i] for i in pending],
+                    api_key=current_api_key,
+                    model=model,
+                    provider=provider,
+                    images_bytes=[loaded[i][0] for i in pending],
                     is_academic_mode=is_academic_mode
                 )
-                
                 if success:
-                    f.write(f"{analysis}\\n\\n")
-                    success_count += 1
-                else:
-                    f.write(f"*分析失敗: {analysis}*\\n\\n")
+                    for i, analysis in zip(pending, analyses):
+                        chunk_results[i] = (True, analysis)
+                        if loaded[i][2] is not None:
+                            llm_cache.set(loaded[i][2], analysis)
+                    pending = []
+            
+            # 單張圖片或批次失敗時逐張分析
+            for i in pending:
+                chunk_results[i] = analyze_one(
+                    paths[i], loaded[i][0], loaded[i][1]
+                )
+            return chunk_results
+        
+        provider_display = {
+            "openai": "OpenAI",
+            "gemini": "Google Gemini"
+        }.get(provider.lower(), provider.upper())
+        
+        def format_section(img_path, success, analysis):
+            img_name = os.path.basename(img_path)
+            body = analysis if success else f"*分析失敗: {analysis}*"
+            return (
+                f"## 投影片：{img_name}\n\n"
+                f"![{img_name}]({img_path})\n\n"
+                f"{body}\n\n"
+            )
+        
+        # OpenAI 與 Gemini 支援在一次請求中分析多張圖片
+        if provider.lower() not in ("openai", "gemini"):
+            batch_size = 1
+        batch_size = max(1, batch_size)
+        
+        # 各批圖片的 API 呼叫互不相關，以有限的線程池並行執行；
+        # 完成順序不定，由呼叫端線程依原始順序寫出已連續完成的部分。
+        # 每批連續完成的段落立即追加並 flush，中途當機也保留已完成的結果
+        results = {}
+        next_index = 0
+        success_count = 0
+        done_count = 0
+        failed = []
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(f"# 投影片內容 {provider_display} 視覺分析\n\n")
+        
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            
+            futures = {
+                executor.submit(
+                    analyze_chunk, image_files[start:start + batch_size]
+                ): start
+                for start in range(0, len(image_files), batch_size)
+            }
+            for future in as_completed(futures):
+                start = futures[future]
+                count = len(image_files[start:start + batch_size])
+                try:
+                    chunk_results = future.result()
+                except Exception as e:
+                    chunk_results = [(False, str(e))] * count
+                for offset, result in enumerate(chunk_results):
+                    results[start + offset] = result
+                
+                done_count += count
+                if progress_callback:
+                    progress_callback(done_count, len(image_files))
+                
+                # 連續完成的段落（例如快取命中）合併為一次寫入
+                ready = []
+                while next_index in results:
+                    success, analysis = results.pop(next_index)
+                    ready.append(
+                        format_section(image_files[next_index], success, analysis)
+                    )
+                    if success:
+                        success_count += 1
+                    else:
+                        failed.append((image_files[next_index], analysis))
+                    next_index += 1
+                if ready:
+                    _append_markdown_section(output_file, "".join(ready))
         
         if success_count > 0:
             msg = (
                 f"已分析 {success_count}/{len(image_files)} 張圖片"
                 f"並生成 Markdown 檔案: {output_file}"
             )
-            messagebox.showinfo("成功", msg)
+            if failed:
+                failed_names = "\n".join(
+                    os.path.basename(path) for path, _ in failed[:10]
+                )
+                msg += f"\n\n以下 {len(failed)} 張圖片分析失敗:\n{failed_names}"
+                if len(failed) > 10:
+                    msg += "\n..."
+            notify("成功", msg, "info")
             return {
                 "success": True, 
                 "total_slides": len(image_files), 
                 "analyzed_slides": success_count,
+                "failed": failed,
+                "cache_hits": cache_stats["hits"],
+                "cache_misses": cache_stats["misses"],
                 "output_file": output_file
             }
         else:
-            messagebox.showwarning("警告", "所有圖片分析均失敗")
-            return {"success": False, "error": "所有圖片分析均失敗"}
+            notify("警告", "所有圖片分析均失敗", "warning")
+            return {
+                "success": False,
+                "error": "所有圖片分析均失敗",
+                "failed": failed
+            }
             
     except Exception as e:
         error_msg = traceback.format_exc()
-        print(f"分析圖片時出錯: {str(e)}\\n{error_msg}")
-        messagebox.showerror("錯誤", f"分析圖片時出錯:\\n{str(e)}")
+        print(f"分析圖片時出錯: {str(e)}\n{error_msg}")
+        notify("錯誤", f"分析圖片時出錯:\n{str(e)}", "error")
         return {"success": False, "error": str(e), "details": error_msg}
 
 
 class EnhancedChromeCapture:
     """增強型 Chrome 捕獲應用"""
     
-    def __init__(self, root):
+    def __init__(self, root, use_cache=True):
         self.root = root
+        self.use_cache = use_cache  # 是否使用視覺模型分析結果快取
         self.root.title("Chrome 投影片捕獲與分析工具")
         self.root.geometry("1000x750")
         
         # 圖片選擇相關變數
         self.image_files = []
-        self.selected_images = []
+        self.image_folder = None
+        self.image_folder_stat = None  # 載入時資料夾的 os.stat 結果
+        self.selected_images = bytearray()
+        self.selected_count = 0  # 已選擇的圖片數，於切換選擇時更新
+        self._n_images = 0
         self.current_image_index = 0
         self.image_label = None
         self.image_preview = None
-        self.image_cache = []  # 添加圖片緩存列表，防止圖片被垃圾回收
+        # 預覽縮圖 LRU 快取：(路徑, 寬, 高) -> PhotoImage，同時防止圖片被垃圾回收
+        self.thumb_cache = OrderedDict()
+        # 每張約 800x400x4 位元組，16 張約 20MB；前後預載共 4 張仍在範圍內
+        self.thumb_cache_size = 16
+        # 背景預先解碼的相鄰圖片（PIL 影像），由主線程取用
+        self._prefetch_pool = ThreadPoolExecutor(max_workers=1)
+        self._prefetch_futures = []
+        self._prepared_pil = {}
+        # 處理投影片在工作線程執行，結果經由佇列交回主線程
+        self._task_queue = queue.Queue()
+        # 顯示中的提示視窗
+        self._toasts = []
+        # 處理方式 -> 處理函數
+        self._dispatch = {
+            "markitdown": self._run_markitdown,
+            "openai": self._run_vision
+        }
         
         # 創建頁面框架
         self.setup_ui()
@@ -407,7 +968,16 @@ class EnhancedChromeCapture:
         self.image_frame = tk.Frame(preview_frame, bg="black")
         self.image_frame.pack(fill=tk.BOTH, expand=True)
         
-        # 創建初始標籤顯示
+        # 視窗縮放時延遲重繪，只處理最後一次尺寸變化
+        self._resize_job = None
+        self._last_frame_size = None
+        self.image_frame.bind("<Configure>", self._on_resize)
+        
+        # 記錄選擇頁的尺寸，顯示圖片時不必再查詢 Tk 幾何資訊
+        self._select_size = (0, 0)
+        frame.bind("<Configure>", self._cache_select_size)
+        
+        # 創建圖片標籤，之後只更新其圖片
         self.image_label = tk.Label(self.image_frame, text="尚未載入圖片")
         self.image_label.pack(fill=tk.BOTH, expand=True)
         
@@ -488,6 +1058,14 @@ class EnhancedChromeCapture:
         self.api_key_entry = tk.Entry(api_frame, width=40)
         self.api_key_entry.pack(side=tk.LEFT, padx=5, fill=tk.X, expand=True)
         
+        # 同時進行的 API 請求數，過高容易觸發提供者的速率限制
+        tk.Label(api_frame, text="並行數:").pack(side=tk.LEFT, padx=5)
+        self.max_workers_var = tk.IntVar(value=4)
+        tk.Spinbox(
+            api_frame, from_=1, to=16, width=4,
+            textvariable=self.max_workers_var
+        ).pack(side=tk.LEFT, padx=5)
+        
         # API 提供者選擇
         provider_frame = tk.Frame(frame)
         provider_frame.pack(fill=tk.X, pady=10)
@@ -521,9 +1099,6 @@ class EnhancedChromeCapture:
             "gemini-2.5-flash-preview-05-20"
         ]
         
-        # 定義 Gemini 模型列表，並輸出以供調試
-        print("初始化 Gemini 模型列表:", self.gemini_models)
-        
         self.model_menu = ttk.Combobox(
             model_frame, 
             textvariable=self.model_var, 
@@ -585,6 +1160,13 @@ class EnhancedChromeCapture:
             variable=self.academic_mode
         ).pack(side=tk.LEFT, padx=5)
         
+        # 分析結果快取：相同圖片不重複呼叫 API
+        self.use_cache_var = tk.BooleanVar(value=self.use_cache)
+        tk.Checkbutton(
+            method_frame, text="使用分析快取",
+            variable=self.use_cache_var
+        ).pack(side=tk.LEFT, padx=5)
+        
         # 按鈕區域
         btn_frame = tk.Frame(frame)
         btn_frame.pack(fill=tk.X, pady=20)
@@ -595,31 +1177,28 @@ class EnhancedChromeCapture:
         )
         self.process_btn.pack(pady=10)
         
+        # 視覺模型分析進度
+        self.progress_var = tk.StringVar(value="")
+        self.progress_bar = ttk.Progressbar(
+            btn_frame, orient=tk.HORIZONTAL, length=400, mode="determinate"
+        )
+        self.progress_bar.pack(pady=5)
+        tk.Label(btn_frame, textvariable=self.progress_var).pack()
+        
         # 初始化模型選項
-        print("初始化模型選項...")
         self.update_model_options()
     
     def update_model_options(self):
         """根據選擇的 API 提供者更新模型選項"""
         provider = self.provider_var.get()
         
-        print(f"更新模型選項，選擇的提供者: {provider}")
-        
+        # config 會自動排程重繪，不需強制更新下拉選單
         if provider == "gemini":
-            print("Gemini 模型列表:", self.gemini_models)
             self.model_menu.config(values=self.gemini_models)
             self.model_var.set(self.gemini_models[0])
         else:  # OpenAI
-            print("OpenAI 模型列表:", self.openai_models)
             self.model_menu.config(values=self.openai_models)
             self.model_var.set(self.openai_models[0])
-            
-        # 確認 Combobox 的值是否已更新
-        print(f"下拉選單當前值: {self.model_menu['values']}")
-        print(f"當前選中的模型: {self.model_var.get()}")
-        
-        # 強制更新下拉選單
-        self.model_menu.update()
     
     def browse_folder(self, entry_widget):
         """瀏覽並選擇資料夾"""
@@ -634,24 +1213,29 @@ class EnhancedChromeCapture:
     def load_images_for_selection(self):
         """載入要選擇的圖片"""
         folder = self.select_folder_entry.get()
-        if not os.path.exists(folder):
+        try:
+            st = os.stat(folder)
+        except OSError:
             messagebox.showwarning("警告", f"資料夾不存在: {folder}")
             return
         
-        # 獲取所有圖片檔案路徑
-        self.image_files = []
-        for filename in sorted(os.listdir(folder)):
-            if filename.lower().endswith(('.png', '.jpg', '.jpeg')):
-                self.image_files.append(os.path.join(folder, filename))
+        # 獲取所有圖片檔案路徑，並記錄資料夾狀態供分析頁沿用
+        self.image_files = _list_images(folder, st.st_mtime_ns)
+        self.image_folder = folder
+        self.image_folder_stat = st
         
         if not self.image_files:
             messagebox.showinfo("提示", "未找到圖片檔案")
             return
         
         # 重置選擇狀態
-        self.selected_images = [False] * len(self.image_files)
+        self._n_images = len(self.image_files)
+        # 以 bytearray 記錄選擇狀態，每張圖片只佔 1 位元組
+        self.selected_images = bytearray(self._n_images)
+        self.selected_count = 0
         self.current_image_index = 0
-        self.image_cache = []  # 清空圖片緩存
+        self.thumb_cache.clear()  # 清空縮圖快取
+        self._prepared_pil = {}
         
         # 顯示第一張圖片
         self.show_current_image()
@@ -670,50 +1254,13 @@ class EnhancedChromeCapture:
         if not self.image_files:
             return
         
-        # 讀取圖片
         img_path = self.image_files[self.current_image_index]
-        img = Image.open(img_path)
-        
-        # 調整圖片大小以適應視窗
-        window_width = self.select_frame.winfo_width() - 40
-        window_height = self.select_frame.winfo_height() - 200
-        
-        if window_width <= 100 or window_height <= 100:
-            # 如果框架還沒有正確的尺寸，使用預設尺寸
-            window_width = 800
-            window_height = 400
-        
-        img_width, img_height = img.size
-        scale = min(window_width/img_width, window_height/img_height)
-        
-        new_width = int(img_width * scale)
-        new_height = int(img_height * scale)
-        
-        # 確保至少有一個像素
-        new_width = max(1, new_width)
-        new_height = max(1, new_height)
-        
-        # 調整圖片大小
-        resized_img = img.resize((new_width, new_height), Image.LANCZOS)
-        
-        # 清除現有顯示
-        if self.image_label:
-            self.image_label.destroy()
-        
-        # 創建新的Photo對象並保存到實例變數中
-        photo = ImageTk.PhotoImage(resized_img)
-        
-        # 保存到緩存中避免被垃圾回收
-        self.image_cache.append(photo)
+        window_width, window_height = self._preview_box()
+        photo = self._get_thumbnail(img_path, window_width, window_height)
         
-        # 限制緩存大小
-        if len(self.image_cache) > 30:
-            self.image_cache = self.image_cache[-15:]
-        
-        # 創建新的Label顯示圖片
-        self.image_label = tk.Label(self.image_frame, image=photo)
+        # 重用同一個 Label，只替換圖片
+        self.image_label.configure(image=photo, text="")
         self.image_label.image = photo  # 保存引用防止被垃圾回收
-        self.image_label.pack(pady=10)
         
         # 更新選中狀態
         current_idx = self.current_image_index
@@ -724,10 +1271,9 @@ class EnhancedChromeCapture:
         
         # 更新狀態
         img_name = os.path.basename(img_path)
-        selected_count = sum(self.selected_images)
         self.status_var.set(
-            f"圖片 {self.current_image_index + 1}/{len(self.image_files)}: "
-            f"{img_name} (已選擇: {selected_count}張)"
+            f"圖片 {self.current_image_index + 1}/{self._n_images}: "
+            f"{img_name} (已選擇: {self.selected_count}張)"
         )
         
         # 更新按鈕狀態
@@ -736,9 +1282,97 @@ class EnhancedChromeCapture:
         )
         self.next_btn.config(
             state=tk.NORMAL 
-            if self.current_image_index < len(self.image_files) - 1 
+            if self.current_image_index < self._n_images - 1 
             else tk.DISABLED
         )
+        
+        # 使用者通常會接著看相鄰的圖片，在背景預先解碼
+        self._prefetch_neighbors(self.current_image_index)
+    
+    def _on_resize(self, event):
+        """預覽區尺寸變化時，以 100ms 延遲合併連續的重繪請求"""
+        size = (event.width, event.height)
+        if size == self._last_frame_size:
+            return
+        self._last_frame_size = size
+        
+        if not self.image_files:
+            return
+        if self._resize_job:
+            self.root.after_cancel(self._resize_job)
+        self._resize_job = self.root.after(100, self._do_resize)
+    
+    def _do_resize(self):
+        """執行延遲的重繪"""
+        self._resize_job = None
+        self.show_current_image()
+    
+    def _cache_select_size(self, event):
+        """選擇頁尺寸變化時記錄新的寬高"""
+        if event.widget is self.select_frame:
+            self._select_size = (event.width, event.height)
+    
+    def _preview_box(self):
+        """計算預覽區可用的最大寬高"""
+        window_width = self._select_size[0] - 40
+        window_height = self._select_size[1] - 200
+        
+        if window_width <= 100 or window_height <= 100:
+            # 如果框架還沒有正確的尺寸，使用預設尺寸
+            window_width = 800
+            window_height = 400
+        return window_width, window_height
+    
+    def _get_thumbnail(self, img_path, window_width, window_height):
+        """取得縮放到預覽區大小的 PhotoImage，重複瀏覽時直接從快取取用"""
+        key = (img_path, window_width, window_height)
+        photo = self.thumb_cache.get(key)
+        if photo is not None:
+            self.thumb_cache.move_to_end(key)
+            return photo
+        
+        # 背景線程已預先解碼時直接使用，否則在此解碼
+        resized_img = self._prepared_pil.pop(key, None)
+        if resized_img is None:
+            resized_img = _decode_preview(img_path, window_width, window_height)
+        
+        # PhotoImage 必須在 Tk 主線程建立
+        photo = ImageTk.PhotoImage(resized_img)
+        self.thumb_cache[key] = photo
+        if len(self.thumb_cache) > self.thumb_cache_size:
+            self.thumb_cache.popitem(last=False)
+        return photo
+    
+    def _prefetch_neighbors(self, index):
+        """在背景線程預先解碼前後各兩張圖片，下一張優先"""
+        # 取消尚未開始的舊預載（使用者跳到別處時它們已無用）
+        for future in self._prefetch_futures:
+            future.cancel()
+        self._prefetch_futures = []
+        
+        window_width, window_height = self._preview_box()
+        wanted = []
+        for i in (index + 1, index - 1, index + 2, index - 2):
+            if 0 <= i < self._n_images:
+                wanted.append((self.image_files[i], window_width, window_height))
+        
+        # 只保留仍在目前位置附近的預備結果
+        prepared = self._prepared_pil
+        self._prepared_pil = {k: prepared[k] for k in wanted if k in prepared}
+        
+        for key in wanted:
+            if key in self.thumb_cache or key in self._prepared_pil:
+                continue
+            self._prefetch_futures.append(
+                self._prefetch_pool.submit(self._decode_for_cache, key)
+            )
+    
+    def _decode_for_cache(self, key):
+        """背景線程：解碼並縮放圖片，結果交由主線程建立 PhotoImage"""
+        try:
+            self._prepared_pil[key] = _decode_preview(*key)
+        except Exception as e:
+            print(f"預先載入圖片 {key[0]} 時出錯: {str(e)}")
     
     def prev_image(self):
         """顯示上一張圖片"""
@@ -748,7 +1382,7 @@ class EnhancedChromeCapture:
     
     def next_image(self):
         """顯示下一張圖片"""
-        if self.current_image_index < len(self.image_files) - 1:
+        if self.current_image_index < self._n_images - 1:
             self.current_image_index += 1
             self.show_current_image()
     
@@ -759,8 +1393,8 @@ class EnhancedChromeCapture:
             
         # 切換選擇狀態
         current_idx = self.current_image_index
-        is_selected = self.selected_images[current_idx]
-        self.selected_images[current_idx] = not is_selected
+        self.selected_images[current_idx] ^= 1
+        self.selected_count += 1 if self.selected_images[current_idx] else -1
         self.show_current_image()
     
     def save_selected_images(self):
@@ -789,8 +1423,19 @@ class EnhancedChromeCapture:
                 dest_path = os.path.join(selected_folder, new_filename)
                 
                 try:
-                    import shutil
-                    shutil.copy2(img_path, dest_path)
+                    if os.path.lexists(dest_path):
+                        if os.path.samefile(img_path, dest_path):
+                            copied_count += 1
+                            continue
+                        # 先移除舊檔，避免覆寫到與其他圖片共用的硬連結
+                        os.remove(dest_path)
+                    
+                    # 同一檔案系統上建立硬連結，不需複製資料；
+                    # 跨裝置或不支援時改為只複製內容
+                    try:
+                        os.link(img_path, dest_path)
+                    except OSError:
+                        _copy_file(img_path, dest_path)
                     copied_count += 1
                 except Exception as e:
                     print(f"複製圖片 {img_path} 時出錯: {str(e)}")
@@ -840,14 +1485,15 @@ class EnhancedChromeCapture:
                     # 檢查是否已捕獲投影片（檢查輸出目錄是否有圖片）
                     slides_folder = "slides"
                     capture_has_slides = False
-                    if os.path.exists(slides_folder):
-                        # 檢查是否有圖片檔案
-                        for file in os.listdir(slides_folder):
-                            if file.lower().endswith(
-                                ('.png', '.jpg', '.jpeg')
-                            ):
-                                capture_has_slides = True
-                                break
+                    folder_has_files = False
+                    if os.path.isdir(slides_folder):
+                        # 一次掃描同時確認資料夾非空與是否有圖片檔案
+                        with os.scandir(slides_folder) as entries:
+                            for entry in entries:
+                                folder_has_files = True
+                                if _splitext(entry.name)[1].lower() in _EXT_SET:
+                                    capture_has_slides = True
+                                    break
                     
                     # 關閉捕獲窗口
                     capture_root.destroy()
@@ -857,8 +1503,7 @@ class EnhancedChromeCapture:
                     self.root.update()
                     
                     # 如果有新捕獲的投影片，填充到資料夾輸入框
-                    if (os.path.exists(slides_folder) and 
-                            os.listdir(slides_folder)):
+                    if folder_has_files:
                         self.select_folder_entry.delete(0, tk.END)
                         self.select_folder_entry.insert(0, slides_folder)
                         # 切換到圖片選擇標籤頁
@@ -879,7 +1524,6 @@ class EnhancedChromeCapture:
                                 )
                 except Exception as e:
                     print(f"關閉捕獲工具時出錯: {str(e)}")
-                    import traceback
                     traceback.print_exc()
                     self.root.deiconify()  # 確保主窗口恢復
                     
@@ -907,132 +1551,105 @@ class EnhancedChromeCapture:
         else:
             messagebox.showwarning("警告", "無法獲取選擇投影片頁面資訊")
     
+    def _snapshot_config(self):
+        """
+        一次讀出分析頁的所有選項
+        
+        Tk 變數不可在工作線程存取，處理流程只使用這份快照
+        """
+        try:
+            max_workers = int(self.max_workers_var.get())  # 獲取並行數
+        except (tk.TclError, ValueError):
+            max_workers = 4
+        return types.SimpleNamespace(
+            folder_path=self.folder_entry.get().strip(),
+            api_key=self.api_key_entry.get().strip(),
+            model=self.model_var.get(),
+            provider=self.provider_var.get(),  # 獲取提供者選項
+            method=self.method_var.get(),  # markitdown 或 openai
+            output_format=self.format_var.get(),  # 獲取輸出格式
+            academic_mode=self.academic_mode.get(),  # 獲取學術模式選項
+            use_cache=self.use_cache_var.get(),  # 是否使用分析結果快取
+            max_workers=max_workers
+        )
+    
     def process_slides(self):
         """處理選擇的投影片"""
         # 獲取選項
-        folder_path = self.folder_entry.get().strip()
-        api_key = self.api_key_entry.get().strip()
-        model = self.model_var.get()
-        provider = self.provider_var.get()  # 獲取提供者選項
-        method = self.method_var.get()  # 獲取處理方式：markitdown 或 openai
-        output_format = self.format_var.get()  # 獲取輸出格式
-        academic_mode = self.academic_mode.get()  # 獲取學術模式選項
+        cfg = self._snapshot_config()
         
         # 檢查輸入
-        if not folder_path:
+        if not cfg.folder_path:
             self.show_message("錯誤", "請輸入投影片資料夾路徑", "error")
             return
         
         # 在當前目錄下建立資料夾
-        input_folder = os.path.join(os.getcwd(), folder_path)
-        if not os.path.exists(input_folder):
+        input_folder = os.path.join(os.getcwd(), cfg.folder_path)
+        try:
+            st = os.stat(input_folder)
+        except OSError:
             self.show_message("錯誤", f"找不到資料夾: {input_folder}", "error")
             return
-
-        markdown_file_path = None
-        
-        if method == "markitdown":
-            # 使用 MarkItDown 處理投影片
-            # 轉換 UI 選擇的格式為 process_captured_slides 函數所需格式
-            pct_format = "markdown"  # 預設生成 Markdown
-            if output_format == "pptx":
-                pct_format = "pptx"
-            elif output_format in ["both", "all"]:
-                pct_format = "both"
-                
-            # 執行 MarkItDown 處理
-            from markitdown_ppt import process_captured_slides
-            success = process_captured_slides(
-                slides_folder=input_folder,
-                output_format=pct_format,
-                api_key=api_key,
-                model=model,
-                provider=provider,
-                is_academic_mode=academic_mode
-            )
-            
-            if success:
-                # 找出產生的 Markdown 文件
-                if output_format in ["markdown", "both", "all", "docx"]:
-                    expected_md = os.path.join(
-                        os.path.dirname(input_folder), 
-                        "slides_analysis.md"
-                    )
-                    if os.path.exists(expected_md):
-                        self.show_message(
-                            "成功", 
-                            f"已生成 Markdown 檔案: {expected_md}",
-                            "info"
-                        )
-                        markdown_file_path = expected_md
-                    else:
-                        self.show_message(
-                            "警告", 
-                            "處理成功但找不到 Markdown 檔案",
-                            "warning"
-                        )
-                
-                # 檢查 PPT 檔案是否生成
-                if output_format in ["pptx", "both", "all"]:
-                    expected_ppt = os.path.join(
-                        os.path.dirname(input_folder), 
-                        "slides.pptx"
-                    )
-                    if os.path.exists(expected_ppt):
-                        self.show_message(
-                            "成功", 
-                            f"已生成 PowerPoint 檔案: {expected_ppt}",
-                            "info"
-                        )
-                    else:
-                        self.show_message(
-                            "警告", 
-                            "處理成功但找不到 PowerPoint 檔案",
-                            "warning"
-                        )
-            else:
-                self.show_message(
-                    "錯誤", 
-                    "MarkItDown 處理失敗，請檢查日誌了解詳情",
-                    "error"
-                )
-                return
-        else:  # method == "openai"
-            # 使用視覺模型
-            result = process_with_image_analyzer(
-                slides_folder=input_folder, 
-                api_key=api_key,
-                model=model,
-                provider=provider,
-                output_file=None,  # 使用預設輸出檔案
-                is_academic_mode=academic_mode
+        cfg.input_folder = input_folder
+        
+        # 分析的資料夾就是「選擇投影片」已載入且未變動的資料夾時，
+        # 直接沿用其圖片清單；否則在此列出一次，交給處理函數使用
+        prev = self.image_folder_stat
+        if (self.image_files and prev is not None and
+                os.path.samestat(st, prev) and
+                st.st_mtime_ns == prev.st_mtime_ns):
+            cfg.image_files = list(self.image_files)
+        else:
+            cfg.image_files = _list_images(input_folder, st.st_mtime_ns)
+        
+        # 處理期間停用按鈕，避免重複送出
+        self.process_btn.config(state=tk.DISABLED)
+        self.progress_bar["value"] = 0
+        self.progress_var.set("處理中...")
+        
+        # Tk 變數已在主線程讀出，工作線程只使用這份設定
+        threading.Thread(
+            target=self._process_worker, args=(cfg,), daemon=True
+        ).start()
+        self.root.after(100, self._drain_queue)
+    
+    def _process_worker(self, cfg):
+        """工作線程：執行投影片處理，不直接操作任何 Tk 元件"""
+        try:
+            self._run_processing(cfg)
+        except Exception as e:
+            traceback.print_exc()
+            self._post_message("錯誤", f"處理投影片時出錯:\n{str(e)}", "error")
+        finally:
+            self._task_queue.put(("done",))
+    
+    def _run_processing(self, cfg):
+        """處理投影片的主要流程（在工作線程執行）"""
+        # 先確認 API Key 有效，避免每張圖片各自因驗證失敗而浪費請求
+        if cfg.api_key and not self._check_api_key(cfg.provider, cfg.api_key):
+            self._post_message(
+                "錯誤",
+                f"{cfg.provider.upper()} API Key 無效，請重新輸入",
+                "error"
             )
-            
-            if result.get("success"):
-                markdown_file_path = result.get("output_file")
-                
-                self.show_message(
-                    "成功", 
-                    f"處理完成!\n\n已處理 {result.get('total_slides', 0)} 張投影片\n"
-                    f"Markdown 檔案: {markdown_file_path}",
-                    "info"
-                )
-            else:
-                self.show_message(
-                    "錯誤", 
-                    f"處理失敗: {result.get('error', '未知錯誤')}", 
-                    "error"
-                )
-                return
+            return
+        
+        # 依處理方式分派，各處理函數返回 (是否成功, 訊息, Markdown 檔案路徑)
+        success, message, markdown_file_path = self._dispatch[cfg.method](cfg)
+        self._post_message(
+            "成功" if success else "錯誤", message,
+            "info" if success else "error"
+        )
+        if not success:
+            return
         
         # 處理 Word (.docx) 轉換
-        if markdown_file_path and output_format in ["docx", "all"]:
+        if markdown_file_path and cfg.output_format in ["docx", "all"]:
             try:
-                import shutil
                 pandoc_path = shutil.which("pandoc")
                 
                 if not pandoc_path:
-                    self.show_message(
+                    self._post_message(
                         "錯誤",
                         "未安裝 Pandoc，無法轉換為 Word 格式。\n"
                         "請從 https://pandoc.org/installing.html 安裝 Pandoc。",
@@ -1049,38 +1666,201 @@ class EnhancedChromeCapture:
                         markdown_file_path, 
                         docx_path
                     ):
-                        self.show_message(
+                        self._post_message(
                             "成功",
                             f"已將 Markdown 轉換為 Word 檔案: {docx_path}",
                             "info"
                         )
                     else:
-                        self.show_message(
+                        self._post_message(
                             "錯誤",
                             "Word 轉換失敗，請檢查錯誤日誌",
                             "error"
                         )
                 except ImportError:
-                    self.show_message(
+                    self._post_message(
                         "錯誤",
                         "找不到 markdown_converter 模組，無法轉換為 Word",
                         "error"
                     )
             except Exception as e:
-                self.show_message(
+                self._post_message(
                     "錯誤",
                     f"Word 轉換時出錯: {str(e)}",
                     "error"
                 )
     
+    def _run_markitdown(self, cfg):
+        """使用 MarkItDown 處理投影片"""
+        # MarkItDown 的輸出檔案位於投影片資料夾內
+        expected_md = os.path.join(cfg.input_folder, "slides_analysis.md")
+        expected_ppt = os.path.join(cfg.input_folder, "slides.pptx")
+        
+        # 轉換 UI 選擇的格式為 process_captured_slides 函數所需格式
+        pct_format = "markdown"  # 預設生成 Markdown
+        if cfg.output_format == "pptx":
+            pct_format = "pptx"
+        elif cfg.output_format in ["both", "all"]:
+            pct_format = "both"
+            
+        # 執行 MarkItDown 處理
+        success = _load_markitdown_ppt().process_captured_slides(
+            slides_folder=cfg.input_folder,
+            output_format=pct_format,
+            api_key=cfg.api_key,
+            model=cfg.model,
+            provider=cfg.provider,
+            is_academic_mode=cfg.academic_mode,
+            use_cache=cfg.use_cache
+        )
+        if not success:
+            return False, "MarkItDown 處理失敗，請檢查日誌了解詳情", None
+        
+        markdown_file_path = None
+        lines = []
+        
+        # 找出產生的 Markdown 文件
+        if cfg.output_format in ["markdown", "both", "all", "docx"]:
+            if os.path.exists(expected_md):
+                lines.append(f"已生成 Markdown 檔案: {expected_md}")
+                markdown_file_path = expected_md
+            else:
+                lines.append("警告：處理成功但找不到 Markdown 檔案")
+        
+        # 檢查 PPT 檔案是否生成
+        if cfg.output_format in ["pptx", "both", "all"]:
+            if os.path.exists(expected_ppt):
+                lines.append(f"已生成 PowerPoint 檔案: {expected_ppt}")
+            else:
+                lines.append("警告：處理成功但找不到 PowerPoint 檔案")
+        
+        return True, "\n".join(lines) or "處理完成", markdown_file_path
+    
+    def _run_vision(self, cfg):
+        """使用視覺模型分析投影片"""
+        image_files = _dedupe_images(cfg.image_files)
+        if len(image_files) < len(cfg.image_files):
+            print(
+                f"略過 {len(cfg.image_files) - len(image_files)} 張"
+                f"內容重複的圖片"
+            )
+        
+        result = process_with_image_analyzer(
+            slides_folder=cfg.input_folder, 
+            api_key=cfg.api_key,
+            model=cfg.model,
+            provider=cfg.provider,
+            output_file=None,  # 使用預設輸出檔案
+            is_academic_mode=cfg.academic_mode,
+            use_cache=cfg.use_cache,
+            max_workers=cfg.max_workers,
+            image_files=image_files,
+            progress_callback=lambda done, total: self._task_queue.put(
+                ("progress", done, total)
+            ),
+            notify=self._post_message,
+            batch_size=6
+        )
+        
+        if not result.get("success"):
+            return False, f"處理失敗: {result.get('error', '未知錯誤')}", None
+        
+        markdown_file_path = result.get("output_file")
+        message = (
+            f"處理完成!\n\n已處理 {result.get('total_slides', 0)} 張投影片\n"
+            f"Markdown 檔案: {markdown_file_path}"
+        )
+        if cfg.use_cache:
+            message += (
+                f"\n快取命中 {result.get('cache_hits', 0)} 張，"
+                f"未命中 {result.get('cache_misses', 0)} 張"
+            )
+        return True, message, markdown_file_path
+    
+    def _check_api_key(self, provider, api_key):
+        """檢查 API Key；驗證結果由 image_analyzer 記錄，同一組只驗證一次"""
+        valid = _load_image_analyzer().validate_api_key(api_key, provider)
+        # 無法判斷（例如網路錯誤）時不阻擋
+        return valid is not False
+    
+    def _post_message(self, title, message, type="info"):
+        """工作線程：將訊息交由主線程顯示"""
+        self._task_queue.put(("message", title, message, type))
+    
+    def _drain_queue(self):
+        """主線程：處理工作線程送回的進度與訊息"""
+        while True:
+            try:
+                item = self._task_queue.get_nowait()
+            except queue.Empty:
+                break
+            
+            kind = item[0]
+            if kind == "progress":
+                self._update_progress(item[1], item[2])
+            elif kind == "message":
+                self.show_message(*item[1:])
+            elif kind == "done":
+                self.process_btn.config(state=tk.NORMAL)
+                if self.progress_var.get() == "處理中...":
+                    self.progress_var.set("")
+                return
+        
+        self.root.after(100, self._drain_queue)
+    
+    def _update_progress(self, done, total):
+        """更新視覺模型分析進度條"""
+        self.progress_bar["maximum"] = total
+        self.progress_bar["value"] = done
+        self.progress_var.set(f"已完成 {done}/{total} 張")
+    
     def show_message(self, title, message, type="info"):
-        """顯示消息框"""
-        if type == "error":
-            messagebox.showerror(title, message)
-        elif type == "warning":
-            messagebox.showwarning(title, message)
-        else:
-            messagebox.showinfo(title, message)
+        """顯示消息；以自動消失的提示取代模態對話框，不阻塞事件迴圈"""
+        timeout_ms = 3000 if type == "info" else 8000
+        self._toast(title, message, type, timeout_ms)
+    
+    def _toast(self, title, message, level="info", timeout_ms=3000):
+        """在主視窗右下角顯示一則自動消失的提示，點擊可立即關閉"""
+        print(f"[{title}] {message}")
+        
+        colors = {
+            "info": "#E8F5E9",
+            "warning": "#FFF8E1",
+            "error": "#FFEBEE"
+        }
+        bg = colors.get(level, colors["info"])
+        
+        win = tk.Toplevel(self.root)
+        win.overrideredirect(True)
+        win.attributes("-topmost", True)
+        frame = tk.Frame(win, bg=bg, bd=1, relief=tk.SOLID)
+        frame.pack(fill=tk.BOTH, expand=True)
+        tk.Label(
+            frame, text=title, bg=bg, font=("Arial", 11, "bold"), anchor="w"
+        ).pack(fill=tk.X, padx=10, pady=(8, 2))
+        tk.Label(
+            frame, text=message, bg=bg, justify=tk.LEFT,
+            anchor="w", wraplength=360
+        ).pack(fill=tk.X, padx=10, pady=(0, 8))
+        
+        # 依目前顯示中的提示數往上堆疊，避免互相遮住
+        win.update_idletasks()
+        offset = sum(t.winfo_height() + 8 for t in self._toasts)
+        x = self.root.winfo_rootx() + self.root.winfo_width() - \
+            win.winfo_width() - 20
+        y = self.root.winfo_rooty() + self.root.winfo_height() - \
+            win.winfo_height() - 20 - offset
+        win.geometry(f"+{max(0, x)}+{max(0, y)}")
+        self._toasts.append(win)
+        
+        def close(event=None):
+            if win in self._toasts:
+                self._toasts.remove(win)
+                win.destroy()
+        
+        for widget in (win, frame, *frame.winfo_children()):
+            widget.bind("<Button-1>", close)
+        win.after(timeout_ms, close)
     
     def run(self):
         """運行應用"""
@@ -1088,8 +1868,47 @@ class EnhancedChromeCapture:
 
 
 def main():
-    # 檢查依賴
-    missing_packages = check_dependencies()
+    parser = argparse.ArgumentParser(description="Chrome 投影片捕獲與分析工具")
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="不使用視覺模型分析結果快取，每張圖片都重新呼叫 API"
+    )
+    parser.add_argument(
+        "--refresh-deps", action="store_true",
+        help="忽略先前的依賴檢查結果，重新檢查所有依賴"
+    )
+    parser.add_argument(
+        "--hq-preview", action="store_true",
+        help="預覽圖片使用 LANCZOS 高品質縮放（較慢）"
+    )
+    args = parser.parse_args()
+    
+    global _HIGH_QUALITY_PREVIEW
+    _HIGH_QUALITY_PREVIEW = args.hq_preview
+    
+    frozen = getattr(sys, 'frozen', False)
+    if frozen and sys.stdout is None:
+        # 打包的視窗程式沒有終端機，輸出改寫入日誌檔
+        log_dir = os.path.dirname(_DEPS_CACHE_PATH)
+        os.makedirs(log_dir, exist_ok=True)
+        log_file = open(
+            os.path.join(log_dir, "video2ppt.log"), 'a',
+            encoding='utf-8', buffering=1
+        )
+        sys.stdout = sys.stderr = log_file
+    
+    if args.refresh_deps:
+        _clear_deps_cache()
+    
+    # 打包版本已內含所有依賴；目前環境的依賴已確認齊全時也不再檢查。
+    # 環境鍵值需列出 site-packages，只計算一次並傳給後續步驟
+    env_key = None if frozen else _deps_env_key()
+    if frozen or os.path.exists(_deps_ok_path(env_key)):
+        missing_packages = []
+    else:
+        missing_packages = check_dependencies(env_key)
+        if not missing_packages:
+            _mark_deps_ok(env_key)
     
     if missing_packages:
         print(f"缺少以下依賴: {', '.join(missing_packages)}")
@@ -1100,6 +1919,8 @@ def main():
                 print("依賴安裝失敗，請手動執行：")
                 print(f"pip install {' '.join(missing_packages)}")
                 sys.exit(1)
+            # 安裝後 site-packages 已變動，需重新計算環境鍵值
+            _mark_deps_ok(_deps_env_key())
         else:
             print("請手動安裝以下依賴後再運行:")
             print(f"pip install {' '.join(missing_packages)}")
@@ -1108,7 +1929,7 @@ def main():
     try:
         # 創建並運行應用
         root = tk.Tk()
-        app = EnhancedChromeCapture(root)
+        app = EnhancedChromeCapture(root, use_cache=not args.no_cache)
         
         app.run()
         
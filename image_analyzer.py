@@ -13,11 +13,16 @@ import re
 import base64
 import logging
 import time
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple, Any
 from urllib.parse import urlparse, unquote
 from io import BytesIO
 from PIL import Image
 
+import llm_cache
+
 # 設定日誌
 logging.basicConfig(
     level=logging.INFO,
@@ -26,6 +31,74 @@ logging.basicConfig(
 logger = logging.getLogger("image-analyzer")
 
 
+@functools.lru_cache(maxsize=8)
+def get_openai_client(api_key: str):
+    """
+    取得共用的 OpenAI 客戶端
+    
+    同一個 API Key 重複使用同一個客戶端，其連線池保持 keep-alive，
+    後續請求不必重新建立 TCP/TLS 連線。客戶端可在多個線程間共用。
+    
+    Args:
+        api_key (str): OpenAI API Key
+    
+    Returns:
+        OpenAI: 客戶端實例
+    """
+    from openai import OpenAI
+    return OpenAI(api_key=api_key)
+
+
+# API Key 驗證結果：(提供者, Key) -> 是否有效，每組只向提供者確認一次
+_VALIDATED_KEYS: Dict[Tuple[str, str], bool] = {}
+_VALIDATED_KEYS_LOCK = threading.Lock()
+
+
+def validate_api_key(api_key: str, provider: str = "openai") -> Optional[bool]:
+    """
+    以一次列出模型的請求確認 API Key 是否有效
+    
+    確定的結果會記錄下來，同一組提供者與 Key 在本進程中只驗證一次；
+    網路錯誤等無法判斷的情況不記錄，下次呼叫時重新驗證。
+    
+    Args:
+        api_key (str): API Key (OpenAI 或 Google)
+        provider (str): API 提供者，可為 'openai' 或 'gemini'
+    
+    Returns:
+        Optional[bool]: True/False 表示 Key 有效或無效；無法判斷時返回 None
+    """
+    key = (provider.lower(), api_key)
+    with _VALIDATED_KEYS_LOCK:
+        valid = _VALIDATED_KEYS.get(key)
+    if valid is not None:
+        return valid
+    
+    try:
+        if key[0] == "gemini":
+            import google.generativeai as genai
+            genai.configure(api_key=api_key)
+            next(iter(genai.list_models()), None)
+        else:
+            # 驗證用的客戶端與之後分析共用，連線可以直接沿用
+            get_openai_client(api_key).models.list()
+        valid = True
+    except ImportError:
+        return None
+    except Exception as e:
+        text = str(e).lower()
+        if not ("401" in text or "invalid_api_key" in text or
+                "api key not valid" in text or "api_key_invalid" in text or
+                "incorrect api key" in text):
+            logger.warning(f"無法驗證 API Key: {str(e)}")
+            return None
+        valid = False
+    
+    with _VALIDATED_KEYS_LOCK:
+        _VALIDATED_KEYS[key] = valid
+    return valid
+
+
 def is_url(path: str) -> bool:
     """
     檢查路徑是否為 URL
@@ -50,16 +123,26 @@ def encode_image_to_base64(image_path: str) -> str:
         return ""
 
 
-def compress_image(image_path: str, max_size_mb: float = 1.0) -> str:
-    """嘗試壓縮圖片並返回 base64 編碼"""
+def compress_image(
+    image_path: str,
+    max_size_mb: float = 1.0,
+    image_bytes: Optional[bytes] = None
+) -> str:
+    """嘗試壓縮圖片並返回 base64 編碼（已讀入的 image_bytes 優先）"""
     try:
         # 檢查原始檔案大小
-        file_size = os.path.getsize(image_path) / (1024 * 1024)  # 轉換為 MB
+        if image_bytes is not None:
+            file_size = len(image_bytes) / (1024 * 1024)  # 轉換為 MB
+        else:
+            file_size = os.path.getsize(image_path) / (1024 * 1024)
         if file_size <= max_size_mb:
             return ""  # 不需要壓縮
             
         # 載入圖片
-        img = Image.open(image_path)
+        if image_bytes is not None:
+            img = Image.open(BytesIO(image_bytes))
+        else:
+            img = Image.open(image_path)
         
         # 計算壓縮比例
         quality = min(90, int(max_size_mb / file_size * 100))
@@ -88,29 +171,87 @@ def analyze_image(
     api_key: str,
     model: str = "o4-mini",
     provider: str = "openai",
-    is_academic_mode: bool = False
+    is_academic_mode: bool = False,
+    image_bytes: Optional[bytes] = None,
+    use_cache: bool = False
 ) -> Tuple[bool, str]:
     """
     使用 OpenAI、Gemini 或 DeepSeek API 分析圖片內容
     
+    use_cache 為 True 時，先以圖片內容、模型與提供者查詢磁碟快取
+    （llm_cache），命中時直接返回，不呼叫 API；成功的結果會寫回快取。
+    圖片內容相同即可命中，與檔名或路徑無關。
+    
+    Args:
+        image_path (str): 圖片檔案路徑
+        api_key (str): API Key (OpenAI、Google 或 DeepSeek)
+        model (str): 使用的模型名稱
+        provider (str): API 提供者，可為 'openai'、'gemini' 或 'deepseek'
+        is_academic_mode (bool): 是否為學術模式
+        image_bytes (bytes, optional): 已讀入記憶體的圖片內容，
+            提供時不再從 image_path 讀取檔案
+        use_cache (bool): 是否使用分析結果快取
+    
+    Returns:
+        Tuple[bool, str]: (是否成功, 分析結果)
+    """
+    # DeepSeek 只返回固定模板，不需快取
+    cache_key = None
+    if use_cache and provider.lower() != "deepseek":
+        if image_bytes is None and os.path.isfile(image_path):
+            with open(image_path, 'rb') as f:
+                image_bytes = f.read()
+        if image_bytes is not None:
+            cache_key = llm_cache.make_key(
+                image_bytes, model, provider, is_academic_mode
+            )
+            cached = llm_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"使用快取的分析結果: {image_path}")
+                return True, cached
+    
+    success, analysis = _analyze_image_uncached(
+        image_path, api_key, model, provider, is_academic_mode, image_bytes
+    )
+    if success and cache_key is not None:
+        llm_cache.set(cache_key, analysis)
+    return success, analysis
+
+
+def _analyze_image_uncached(
+    image_path: str,
+    api_key: str,
+    model: str = "o4-mini",
+    provider: str = "openai",
+    is_academic_mode: bool = False,
+    image_bytes: Optional[bytes] = None
+) -> Tuple[bool, str]:
+    """
+    呼叫 API 分析圖片內容（不經過快取）
+    
     Args:
         image_path (str): 圖片檔案路徑
         api_key (str): API Key (OpenAI、Google 或 DeepSeek)
         model (str): 使用的模型名稱
         provider (str): API 提供者，可為 'openai'、'gemini' 或 'deepseek'
         is_academic_mode (bool): 是否為學術模式
+        image_bytes (bytes, optional): 已讀入記憶體的圖片內容，
+            提供時不再從 image_path 讀取檔案
     
     Returns:
         Tuple[bool, str]: (是否成功, 分析結果)
     """
     try:
-        # 檢查圖片是否存在
-        if not os.path.exists(image_path):
-            logger.error(f"圖片不存在: {image_path}")
-            return False, f"圖片不存在: {image_path}"
-        
-        # 檢查圖片大小
-        file_size = os.path.getsize(image_path) / (1024 * 1024)  # MB
+        if image_bytes is not None:
+            file_size = len(image_bytes) / (1024 * 1024)  # MB
+        else:
+            # 檢查圖片是否存在
+            if not os.path.exists(image_path):
+                logger.error(f"圖片不存在: {image_path}")
+                return False, f"圖片不存在: {image_path}"
+            
+            # 檢查圖片大小
+            file_size = os.path.getsize(image_path) / (1024 * 1024)  # MB
         if file_size > 20:
             logger.warning(f"圖片太大 ({file_size:.2f}MB)，超過 API 限制")
             return False, f"圖片太大 ({file_size:.2f}MB)，超過 API 限制"
@@ -167,7 +308,9 @@ def analyze_image(
                 
                 # 加載圖片
                 try:
-                    if isinstance(image_path, (str, bytes)):
+                    if image_bytes is not None:
+                        img = Image.open(BytesIO(image_bytes))
+                    elif isinstance(image_path, (str, bytes)):
                         img = Image.open(image_path)
                     else:
                         # 如果是 BytesIO 對象，重置指針位置
@@ -288,16 +431,16 @@ def analyze_image(
                                         logger.info("已成功提取原始文字")
                                         return True, (
                                             "內容因安全過濾被部分阻擋，" +
-                                            "已嘗試提取原始文字：\\n\\n" +
+                                            "已嘗試提取原始文字：\n\n" +
                                             response.text
                                         )
                                 
                                 return False, (
-                                    "內容被安全過濾器阻擋。建議：\\n" +
-                                    "1. 檢查圖片是否包含過於敏感的醫療或解剖內容。\\n" +
-                                    "2. 嘗試裁剪或編輯圖片，去除可能引起誤判的區域後重試。\\n" +
-                                    "3. 確保已啟用『學術模式』以優化提示詞。\\n" +
-                                    "4. 考慮切換到 OpenAI API 或手動處理。\\n" +
+                                    "內容被安全過濾器阻擋。建議：\n" +
+                                    "1. 檢查圖片是否包含過於敏感的醫療或解剖內容。\n" +
+                                    "2. 嘗試裁剪或編輯圖片，去除可能引起誤判的區域後重試。\n" +
+                                    "3. 確保已啟用『學術模式』以優化提示詞。\n" +
+                                    "4. 考慮切換到 OpenAI API 或手動處理。\n" +
                                     "5. 若確認內容無害，可透過 Gemini API 錯誤回報系統提交案例。"
                                 )
                             elif candidate.finish_reason == 3:  # RECITATION
@@ -358,16 +501,19 @@ def analyze_image(
         else:
             # 使用 OpenAI API
             try:
-                from openai import OpenAI
-                
                 # 轉換圖片為 Base64
-                base64_image = encode_image_to_base64(image_path)
+                if image_bytes is not None:
+                    base64_image = base64.b64encode(image_bytes).decode('utf-8')
+                else:
+                    base64_image = encode_image_to_base64(image_path)
                 if not base64_image:
                     return False, "無法轉換圖片為 Base64 格式"
                 
                 # 如果圖片大於 1MB，嘗試壓縮
                 if file_size > 1:
-                    compressed = compress_image(image_path)
+                    compressed = compress_image(
+                        image_path, image_bytes=image_bytes
+                    )
                     if compressed:
                         base64_image = compressed
                 
@@ -383,7 +529,7 @@ def analyze_image(
                     "請以流暢的段落形式提供分析，而非列表。分析需專業、客觀、準確。"
                 )
                 
-                client = OpenAI(api_key=api_key)
+                client = get_openai_client(api_key)
                 
                 # 建立請求訊息列表
                 messages = [
@@ -462,6 +608,212 @@ def analyze_image(
         return False, f"API 調用異常: {str(e)}"
 
 
+# 批次分析時分隔各張圖片結果的標記
+_BATCH_MARKER = "===SLIDE {index}==="
+_BATCH_MARKER_RE = re.compile(r"^\s*===SLIDE (\d+)===\s*$", re.MULTILINE)
+
+
+def _split_batch_response(text: str, count: int) -> Optional[List[str]]:
+    """依分隔標記拆出各張圖片的分析，缺少任何一張時返回 None"""
+    # split 後為 [前言, 序號1, 內容1, 序號2, 內容2, ...]
+    parts = _BATCH_MARKER_RE.split(text or "")
+    analyses = {}
+    for index, body in zip(parts[1::2], parts[2::2]):
+        analyses[int(index)] = body.strip()
+    
+    results = [analyses.get(i + 1) for i in range(count)]
+    if not all(results):
+        return None
+    return results
+
+
+def analyze_images_batch(
+    image_paths: List[str],
+    api_key: str,
+    model: str = "o4-mini",
+    provider: str = "openai",
+    images_bytes: Optional[List[bytes]] = None,
+    is_academic_mode: bool = False
+) -> Tuple[bool, Any]:
+    """
+    在一次請求中分析多張圖片
+    
+    提示詞要求模型在每張圖片的分析前輸出分隔標記，再依標記拆回
+    各張圖片的結果。支援 OpenAI 與 Gemini；其他提供者、請求失敗、
+    內容被安全過濾或回應無法完整拆分時返回 False，呼叫端應改為逐張分析。
+    
+    Args:
+        image_paths (List[str]): 圖片檔案路徑
+        api_key (str): API Key (OpenAI 或 Google)
+        model (str): 使用的模型名稱
+        provider (str): API 提供者，可為 'openai' 或 'gemini'
+        images_bytes (List[bytes], optional): 已讀入記憶體的圖片內容，
+            順序與 image_paths 相同
+        is_academic_mode (bool): 是否為學術模式
+    
+    Returns:
+        Tuple[bool, Any]: 成功時為 (True, 各張圖片的分析結果列表)，
+            失敗時為 (False, 錯誤訊息)
+    """
+    provider_name = provider.lower()
+    if provider_name not in ("openai", "gemini"):
+        return False, f"{provider} 不支援批次分析"
+    if not image_paths:
+        return True, []
+    
+    instruction = (
+        f"以下依序有 {len(image_paths)} 張投影片圖片，請逐張分析並描述。"
+        "每張圖片的分析前必須單獨一行輸出標記 "
+        f"{_BATCH_MARKER.format(index='N')}，N 為圖片序號（從 1 開始），"
+        "標記之外不要輸出其他分隔文字。"
+    )
+    if is_academic_mode:
+        instruction += (
+            "請僅專注於提取客觀、技術和學術資訊，"
+            "避免任何推斷、個人評價或可能被解釋為敏感內容的描述。"
+        )
+    
+    try:
+        if provider_name == "gemini":
+            text = _gemini_batch_request(
+                image_paths, api_key, model, images_bytes, instruction
+            )
+        else:
+            text = _openai_batch_request(
+                image_paths, api_key, model, images_bytes, instruction
+            )
+        
+        results = _split_batch_response(text, len(image_paths))
+        if results is None:
+            logger.warning("批次分析回應無法完整拆分為各張圖片的結果")
+            return False, "批次分析回應格式不符"
+        return True, results
+        
+    except ImportError as e:
+        logger.error(f"缺少批次分析所需的模組: {str(e)}")
+        return False, f"缺少模組: {str(e)}"
+    except Exception as e:
+        logger.error(f"批次分析失敗: {str(e)}")
+        return False, f"批次分析失敗: {str(e)}"
+
+
+def _openai_batch_request(
+    image_paths: List[str],
+    api_key: str,
+    model: str,
+    images_bytes: Optional[List[bytes]],
+    instruction: str
+) -> str:
+    """將多張圖片放在同一則 OpenAI 訊息中送出，返回回應文字"""
+    content = [{"type": "text", "text": instruction}]
+    for i, image_path in enumerate(image_paths):
+        image_bytes = images_bytes[i] if images_bytes else None
+        if image_bytes is not None:
+            file_size = len(image_bytes) / (1024 * 1024)  # MB
+            base64_image = base64.b64encode(image_bytes).decode('utf-8')
+        else:
+            file_size = os.path.getsize(image_path) / (1024 * 1024)  # MB
+            base64_image = encode_image_to_base64(image_path)
+        if not base64_image:
+            raise ValueError(f"無法轉換圖片為 Base64 格式: {image_path}")
+        
+        # 如果圖片大於 1MB，嘗試壓縮
+        if file_size > 1:
+            compressed = compress_image(image_path, image_bytes=image_bytes)
+            if compressed:
+                base64_image = compressed
+        
+        content.append({
+            "type": "image_url",
+            "image_url": {
+                "url": f"data:image/jpeg;base64,{base64_image}"
+            }
+        })
+    
+    system_prompt = (
+        "你是一個專業的圖片分析和描述專家。你的工作是詳細分析圖片內容，"
+        "提供準確且有深度的描述。請使用繁體中文回應。"
+        "\n\n每張圖片的描述應包含：\n"
+        "1. 總體概述：簡明扼要說明圖片主要內容\n"
+        "2. 詳細分析：包括主要元素、場景、人物、文字等\n"
+        "3. 圖片目的或用途（如果明顯）\n"
+        "4. 若圖片包含文字，請在描述中引用關鍵文字\n\n"
+        "請以流暢的段落形式提供分析，而非列表。分析需專業、客觀、準確。"
+    )
+    
+    request_kwargs = {
+        "model": model,
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": content}
+        ],
+    }
+    if model.startswith("gpt-4o"):
+        request_kwargs["temperature"] = 0.5
+        request_kwargs["max_tokens"] = 1000 * len(image_paths)
+    
+    logger.info(f"使用 OpenAI 模型 {model} 批次分析 {len(image_paths)} 張圖片")
+    response = get_openai_client(api_key).chat.completions.create(
+        **request_kwargs
+    )
+    return response.choices[0].message.content or ""
+
+
+def _gemini_batch_request(
+    image_paths: List[str],
+    api_key: str,
+    model: str,
+    images_bytes: Optional[List[bytes]],
+    instruction: str
+) -> str:
+    """以多段輸入（提示詞與多張圖片）送出一次 Gemini 請求，返回回應文字"""
+    import google.generativeai as genai
+    import google.generativeai.types as genai_types
+    
+    genai.configure(api_key=api_key)
+    
+    parts = [
+        "請以符合安全政策的方式分析以下學術或商業簡報圖片的內容，"
+        "使用繁體中文回應，包含簡報主題和標題、主要文字內容和重點、"
+        "圖表數據的解釋（如有）以及版面結構。" + instruction
+    ]
+    for i, image_path in enumerate(image_paths):
+        image_bytes = images_bytes[i] if images_bytes else None
+        if image_bytes is not None:
+            parts.append(Image.open(BytesIO(image_bytes)))
+        else:
+            parts.append(Image.open(image_path))
+    
+    # 與單張分析相同，安全過濾器僅阻擋高風險內容
+    safety_settings = [
+        {
+            "category": getattr(genai_types.HarmCategory, category),
+            "threshold": genai_types.HarmBlockThreshold.BLOCK_ONLY_HIGH
+        }
+        for category in (
+            "HARM_CATEGORY_HARASSMENT",
+            "HARM_CATEGORY_HATE_SPEECH",
+            "HARM_CATEGORY_SEXUALLY_EXPLICIT",
+            "HARM_CATEGORY_DANGEROUS_CONTENT"
+        )
+    ]
+    gemini_model = genai.GenerativeModel(
+        model_name=model,
+        generation_config={
+            "temperature": 0.4,
+            "top_p": 0.95,
+            "top_k": 0,
+            "max_output_tokens": 2048 * len(image_paths),
+        },
+        safety_settings=safety_settings
+    )
+    
+    logger.info(f"使用 Gemini 模型 {model} 批次分析 {len(image_paths)} 張圖片")
+    response = gemini_model.generate_content(parts)
+    # 被安全過濾器阻擋時 response.text 會拋出例外，由呼叫端改為逐張分析
+    return response.text
+
+
 def find_markdown_images(markdown_text: str) -> List[Dict[str, Any]]:
     """
     從 Markdown 文件中找出所有圖片標記
@@ -503,11 +855,16 @@ def enhance_markdown_with_image_analysis(
     api_key: Optional[str] = None,
     model: str = "o4-mini",
     provider: str = "openai",
-    is_academic_mode: bool = False
+    is_academic_mode: bool = False,
+    max_workers: int = 8,
+    use_cache: bool = False
 ) -> Tuple[str, Dict[str, int]]:
     """
     增強 Markdown 文件中的圖片描述
     
+    各圖片的 API 呼叫彼此獨立，以執行緒池並行送出，
+    最後再依原始位置將分析結果插回 Markdown。
+    
     Args:
         markdown_text (str): Markdown 文字內容
         base_dir (str): 圖片基礎目錄，用於解析相對路徑
@@ -515,6 +872,8 @@ def enhance_markdown_with_image_analysis(
         model (str): 使用的模型
         provider (str): API 提供者，可為 'openai' 或 'gemini'
         is_academic_mode (bool): 是否為學術模式
+        max_workers (int): 同時進行的 API 呼叫數上限
+        use_cache (bool): 是否使用分析結果快取
     
     Returns:
         Tuple[str, Dict[str, int]]: (增強後的 Markdown 文字, 處理統計)
@@ -560,10 +919,7 @@ def enhance_markdown_with_image_analysis(
         "images_failed": 0
     }
     
-    # 按順序處理圖片，但需要記錄位置偏移
-    offset = 0  # 記錄因為插入內容而產生的位置偏移
-    
-    for img_info in images:
+    def analyze_one(img_info: Dict[str, Any]) -> Tuple[bool, str]:
         # 獲取圖片路徑
         img_path = img_info["path"]
         
@@ -572,46 +928,44 @@ def enhance_markdown_with_image_analysis(
             # 相對路徑，轉換為絕對路徑
             img_path = os.path.join(base_dir, img_path)
         
-        # 分析圖片
-        if not is_url(img_path) and os.path.exists(img_path):
-            logger.info(f"分析圖片: {img_path}")
-            success, analysis = analyze_image(
-                image_path=img_path,
-                api_key=api_key,
-                model=model,
-                provider=provider,
-                is_academic_mode=is_academic_mode
-            )
-            
-            if success:
-                # 增強 Markdown
-                enhanced = (
-                    f"{img_info['match']}\n\n"
-                    f"{analysis}\n"
-                )
-                
-                # 計算調整後的位置
-                adjusted_start = img_info['start'] + offset
-                adjusted_end = img_info['end'] + offset
-                
-                # 替換原始 Markdown
-                markdown_text = (
-                    markdown_text[:adjusted_start] +
-                    enhanced +
-                    markdown_text[adjusted_end:]
-                )
-                
-                # 更新偏移量
-                offset += len(enhanced) - (img_info['end'] - img_info['start'])
-                
-                stats["images_analyzed"] += 1
-                logger.info(f"成功分析圖片: {img_path}")
-            else:
-                stats["images_failed"] += 1
-                logger.warning(f"分析圖片失敗: {img_path} - {analysis}")
+        if is_url(img_path) or not os.path.exists(img_path):
+            logger.warning(f"無法訪問圖片: {img_path}")
+            return False, ""
+        
+        logger.info(f"分析圖片: {img_path}")
+        success, analysis = analyze_image(
+            image_path=img_path,
+            api_key=api_key,
+            model=model,
+            provider=provider,
+            is_academic_mode=is_academic_mode,
+            use_cache=use_cache
+        )
+        if success:
+            logger.info(f"成功分析圖片: {img_path}")
         else:
+            logger.warning(f"分析圖片失敗: {img_path} - {analysis}")
+        return success, analysis
+    
+    # 並行分析所有圖片；map 依輸入順序返回結果
+    workers = max(1, min(max_workers, len(images)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(analyze_one, images))
+    
+    # 依原始位置組合結果，避免逐次切片重建整份文字
+    parts = []
+    last_end = 0
+    for img_info, (success, analysis) in zip(images, results):
+        if not success:
             stats["images_failed"] += 1
-            logger.warning(f"無法訪問圖片: {img_path}")
+            continue
+        
+        parts.append(markdown_text[last_end:img_info['start']])
+        parts.append(f"{img_info['match']}\n\n{analysis}\n")
+        last_end = img_info['end']
+        stats["images_analyzed"] += 1
+    parts.append(markdown_text[last_end:])
+    markdown_text = "".join(parts)
     
     return markdown_text, stats
 
@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+延遲載入模組
+
+selenium、pyautogui、PIL 等套件只在特定操作時才需要，
+以 importlib.util.LazyLoader 延後執行模組程式碼，避免拖慢介面啟動。
+"""
+
+import sys
+import importlib.util
+
+
+def lazy_import(name):
+    """
+    延遲載入模組：先建立模組物件，第一次存取屬性時才執行模組程式碼
+    
+    Args:
+        name (str): 模組完整名稱，例如 "PIL.Image"
+    
+    Returns:
+        module: 尚未執行的模組物件；已載入時直接返回 sys.modules 中的模組
+    
+    Raises:
+        ImportError: 找不到模組時
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named '{name}'")
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
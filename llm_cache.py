@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+LLM 回應快取
+
+以圖片內容、模型、提供者與提示詞版本計算鍵值，將視覺模型的分析結果
+保存在 SQLite 檔案中。重複分析同一份投影片時可直接讀取，不再呼叫 API。
+快取總大小超過上限時，依最後使用時間淘汰最久未用的結果。
+"""
+
+import os
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+try:
+    import blake3
+    HAS_BLAKE3 = True
+except ImportError:
+    HAS_BLAKE3 = False
+
+# 預設快取位置（與啟動目錄無關）
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "video2ppt", "llm_cache.sqlite"
+)
+
+# 提示詞內容變更時遞增，使舊的快取失效
+PROMPT_VERSION = "1"
+
+# 快取內容的總位元組上限，超過時淘汰最久未使用的結果
+MAX_CACHE_BYTES = 64 * 1024 * 1024
+
+_conn = None
+_conn_path = None
+_total_bytes = 0  # 目前快取內容的總位元組數
+_lock = threading.Lock()
+
+
+def _get_conn(path: str = DEFAULT_CACHE_PATH) -> sqlite3.Connection:
+    """取得（必要時建立）快取資料庫連線"""
+    global _conn, _conn_path, _total_bytes
+    if _conn is None or _conn_path != path:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        _conn = sqlite3.connect(path, check_same_thread=False)
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "last_used REAL NOT NULL DEFAULT 0, "
+            "size INTEGER NOT NULL DEFAULT 0)"
+        )
+        # 舊版建立的資料表沒有 last_used / size 欄位
+        columns = [row[1] for row in _conn.execute(
+            "PRAGMA table_info(responses)"
+        )]
+        if "last_used" not in columns:
+            _conn.execute(
+                "ALTER TABLE responses "
+                "ADD COLUMN last_used REAL NOT NULL DEFAULT 0"
+            )
+        if "size" not in columns:
+            _conn.execute(
+                "ALTER TABLE responses "
+                "ADD COLUMN size INTEGER NOT NULL DEFAULT 0"
+            )
+            _conn.execute(
+                "UPDATE responses SET size = LENGTH(CAST(value AS BLOB))"
+            )
+        _conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_last_used "
+            "ON responses (last_used)"
+        )
+        _conn.commit()
+        # 只在開啟時計算一次總大小，之後由 set / _evict 增減
+        _total_bytes = _conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+        _conn_path = path
+    return _conn
+
+
+def make_key(
+    image_bytes: bytes,
+    model: str,
+    provider: str,
+    is_academic_mode: bool = False,
+    prompt_version: str = PROMPT_VERSION
+) -> str:
+    """
+    計算快取鍵值
+
+    Args:
+        image_bytes (bytes): 圖片檔案內容
+        model (str): 模型名稱
+        provider (str): API 提供者
+        is_academic_mode (bool): 是否為學術模式（提示詞不同）
+        prompt_version (str): 提示詞版本
+
+    Returns:
+        str: 128 位元雜湊的十六進位字串（有 blake3 時使用 BLAKE3，
+            否則使用 BLAKE2b）
+    """
+    suffix = (
+        f"|{model}|{provider.lower()}|{int(is_academic_mode)}|{prompt_version}"
+    ).encode("utf-8")
+    if HAS_BLAKE3:
+        h = blake3.blake3(image_bytes)
+        h.update(suffix)
+        return "b3" + h.digest(length=16).hex()
+    
+    h = hashlib.blake2b(image_bytes, digest_size=16)
+    h.update(suffix)
+    return h.hexdigest()
+
+
+def get(key: str, path: str = DEFAULT_CACHE_PATH) -> Optional[str]:
+    """讀取快取的分析結果，未命中時返回 None"""
+    try:
+        with _lock:
+            conn = _get_conn(path)
+            row = conn.execute(
+                "SELECT value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row:
+                conn.execute(
+                    "UPDATE responses SET last_used = ? WHERE key = ?",
+                    (time.time(), key)
+                )
+                conn.commit()
+        return row[0] if row else None
+    except sqlite3.Error:
+        return None
+
+
+def set(key: str, value: str, path: str = DEFAULT_CACHE_PATH) -> None:
+    """寫入分析結果；快取失敗不影響主流程"""
+    global _total_bytes
+    size = len(value.encode("utf-8"))
+    try:
+        with _lock:
+            conn = _get_conn(path)
+            row = conn.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, value, last_used, size) VALUES (?, ?, ?, ?)",
+                (key, value, time.time(), size)
+            )
+            _total_bytes += size - (row[0] if row else 0)
+            if _total_bytes > MAX_CACHE_BYTES:
+                _evict(conn)
+            conn.commit()
+    except sqlite3.Error:
+        pass
+
+
+def _evict(conn: sqlite3.Connection) -> None:
+    """從最久未使用的結果開始刪除，直到總大小低於上限（呼叫端須持有鎖）"""
+    global _total_bytes
+    doomed = []
+    for key, size in conn.execute(
+        "SELECT key, size FROM responses ORDER BY last_used"
+    ):
+        if _total_bytes <= MAX_CACHE_BYTES:
+            break
+        doomed.append((key,))
+        _total_bytes -= size
+    conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
@@ -12,7 +12,7 @@ import os
 import sys
 import logging
 import argparse
-import glob
+import importlib.util
 from typing import Dict, List, Optional, Tuple, Any
 
 # 設定日誌
@@ -22,6 +22,20 @@ logging.basicConfig(
 )
 logger = logging.getLogger("markitdown-ppt")
 
+# 圖片副檔名（以 splitext 取出後比對，不必將整個檔名轉為小寫）
+_SLIDE_EXTENSIONS = frozenset({'.png', '.jpg', '.jpeg'})
+_PPT_IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.bmp'})
+
+
+def _list_image_files(folder: str, extensions: frozenset) -> List[str]:
+    """以一次 os.scandir 列出資料夾中指定副檔名的檔案，依檔名排序"""
+    with os.scandir(folder) as entries:
+        return sorted(
+            entry.path for entry in entries
+            if os.path.splitext(entry.name)[1].lower() in extensions
+            and entry.is_file()
+        )
+
 
 def convert_images_to_markdown(
     image_paths: List[str],
@@ -31,7 +45,8 @@ def convert_images_to_markdown(
     api_key: Optional[str] = None,
     model: str = "gpt-4o-mini",
     provider: str = "openai",
-    is_academic_mode: bool = False
+    is_academic_mode: bool = False,
+    use_cache: bool = False
 ) -> Tuple[bool, str, Dict[str, Any]]:
     """
     將多個圖片檔案轉換為單一 Markdown 檔案
@@ -45,6 +60,7 @@ def convert_images_to_markdown(
         model (str): 使用的模型名稱
         provider (str): API 提供者，可為 'openai' 或 'gemini'
         is_academic_mode (bool): 是否啟用學術模式，影響 LLM 提示詞
+        use_cache (bool): 是否使用圖片分析結果快取
         
     Returns:
         Tuple[bool, str, Dict]: (是否成功, 輸出檔案路徑, 處理資訊)
@@ -62,10 +78,8 @@ def convert_images_to_markdown(
                     logger.error("找不到 google.generativeai 模組，請確保已安裝 google-genai 套件")
                     return False, "", {"error": "缺少 Google Generative AI 模組"}
             else:  # 默認為 OpenAI
-                try:
-                    # 將 OpenAI 和 AuthenticationError 移到這裡，避免重複定義
-                    from openai import OpenAI
-                except ImportError:
+                # 只確認 openai 已安裝，客戶端由 image_analyzer 統一建立
+                if importlib.util.find_spec("openai") is None:
                     logger.error("找不到 openai 模組，請確保已安裝相關套件")
                     return False, "", {"error": "缺少 OpenAI 模組"}
             
@@ -142,11 +156,13 @@ def convert_images_to_markdown(
                     use_llm = False
                 else:
                     try:
-                        # 不再重複導入 OpenAI 和 AuthenticationError
-                        # from openai import OpenAI, AuthenticationError 
-                        llm_client = OpenAI(api_key=current_api_key)
-                        # 執行一個簡單的測試呼叫來驗證金鑰
-                        llm_client.models.list() 
+                        # 與 image_analyzer 共用驗證結果（每個 Key 只驗證一次）
+                        from image_analyzer import validate_api_key
+                        valid = validate_api_key(current_api_key, "openai")
+                        if valid is False:
+                            raise ValueError("OpenAI API Key 無效")
+                        if valid is None:
+                            raise RuntimeError("無法驗證 OpenAI API Key")
                         logger.info("OpenAI API Key 驗證成功。")
                         llm_info["status"] = "啟用成功"
                         llm_info["model"] = model
@@ -218,7 +234,8 @@ def convert_images_to_markdown(
                             api_key=current_api_key,
                             model=model,
                             provider=provider,
-                            is_academic_mode=is_academic_mode
+                            is_academic_mode=is_academic_mode,
+                            use_cache=use_cache
                         )
                         
                         # 寫入增強後的內容
@@ -419,7 +436,8 @@ def process_images_to_ppt(
     model: str = "gpt-4o-mini",
     provider: str = "openai",
     template_file: Optional[str] = None,
-    is_academic_mode: bool = False
+    is_academic_mode: bool = False,
+    use_cache: bool = False
 ) -> bool:
     """
     處理資料夾中的圖片，轉換為 Markdown 並生成 PPT
@@ -435,6 +453,7 @@ def process_images_to_ppt(
         provider (str): API 提供者，可為 'openai' 或 'gemini'
         template_file (Optional[str]): PPT 模板檔案路徑
         is_academic_mode (bool): 是否啟用學術模式，影響 LLM 提示詞
+        use_cache (bool): 是否使用圖片分析結果快取
         
     Returns:
         bool: 是否成功生成 PPT
@@ -445,18 +464,12 @@ def process_images_to_ppt(
             logger.error(f"找不到圖片資料夾: {image_dir}")
             return False
             
-        # 獲取圖片檔案列表
-        image_files = []
-        for ext in ['*.jpg', '*.jpeg', '*.png', '*.gif', '*.bmp']:
-            image_files.extend(glob.glob(os.path.join(image_dir, ext)))
-            image_files.extend(glob.glob(os.path.join(image_dir, ext.upper())))
+        # 獲取圖片檔案列表（已按檔名排序）
+        image_files = _list_image_files(image_dir, _PPT_IMAGE_EXTENSIONS)
             
         if not image_files:
             logger.error(f"資料夾中沒有圖片檔案: {image_dir}")
             return False
-            
-        # 按檔名排序
-        image_files.sort()
         
         # 確定輸出 Markdown 檔案路徑
         if not markdown_file:
@@ -475,7 +488,8 @@ def process_images_to_ppt(
             api_key=api_key,
             model=model,
             provider=provider,
-            is_academic_mode=is_academic_mode
+            is_academic_mode=is_academic_mode,
+            use_cache=use_cache
         )
         
         if not success:
@@ -511,7 +525,8 @@ def process_captured_slides(
     api_key: Optional[str] = None, 
     model: str = "gpt-4o-mini",
     provider: str = "openai",
-    is_academic_mode: bool = False
+    is_academic_mode: bool = False,
+    use_cache: bool = False
 ) -> bool:
     """
     處理已捕獲的投影片，生成 Markdown 或 PowerPoint 或兩者都生成
@@ -523,6 +538,7 @@ def process_captured_slides(
         model (str): 使用的模型名稱
         provider (str): API 提供者，可為 'openai' 或 'gemini'
         is_academic_mode (bool): 是否啟用學術模式，影響 LLM 提示詞
+        use_cache (bool): 是否使用圖片分析結果快取
         
     Returns:
         bool: 處理是否成功
@@ -536,10 +552,7 @@ def process_captured_slides(
         return False
     
     # 獲取所有圖片檔案
-    image_files = []
-    for filename in sorted(os.listdir(slides_folder)):
-        if filename.lower().endswith(('.png', '.jpg', '.jpeg')):
-            image_files.append(os.path.join(slides_folder, filename))
+    image_files = _list_image_files(slides_folder, _SLIDE_EXTENSIONS)
     
     if not image_files:
         logger.error(f"資料夾中沒有圖片檔案: {slides_folder}")
@@ -562,7 +575,8 @@ def process_captured_slides(
             api_key=api_key,
             model=model,
             provider=provider,
-            is_academic_mode=is_academic_mode
+            is_academic_mode=is_academic_mode,
+            use_cache=use_cache
         )
         
         if not md_success:
@@ -584,7 +598,8 @@ def process_captured_slides(
             api_key=api_key,
             model=model,
             provider=provider,
-            is_academic_mode=is_academic_mode
+            is_academic_mode=is_academic_mode,
+            use_cache=use_cache
         )
         
         if not ppt_success: